@@ -22,10 +22,178 @@ namespace GH_MCP.Commands
         /// <returns>命令執行結果</returns>
         public static object ConnectComponents(Command command)
         {
+            var connection = ParseConnection(command, out string parseError);
+            if (connection == null)
+            {
+                return Response.CreateError(parseError);
+            }
+
+            // 在 UI 線程上執行連接操作
+            object result = null;
+            Exception exception = null;
+
+            RhinoApp.InvokeOnUiThread(new Action(() =>
+            {
+                try
+                {
+                    // 獲取當前文檔
+                    var doc = Instances.ActiveCanvas?.Document;
+                    if (doc == null)
+                    {
+                        exception = new InvalidOperationException("No active Grasshopper document");
+                        return;
+                    }
+
+                    string lookupError = FindParameters(doc, connection, out IGH_Param sourceParameter, out IGH_Param targetParameter);
+                    if (lookupError != null)
+                    {
+                        exception = new ArgumentException(lookupError);
+                        return;
+                    }
+
+                    // 檢查參數類型相容性
+                    if (!AreParametersCompatible(sourceParameter, targetParameter))
+                    {
+                        exception = new ArgumentException($"Parameters are not compatible: {sourceParameter.GetType().Name} cannot connect to {targetParameter.GetType().Name}");
+                        return;
+                    }
+
+                    // 移除現有連接（如果需要）
+                    if (targetParameter.SourceCount > 0)
+                    {
+                        targetParameter.RemoveAllSources();
+                    }
+
+                    // 連接參數
+                    targetParameter.AddSource(sourceParameter);
+
+                    // 刷新數據
+                    targetParameter.CollectData();
+                    targetParameter.ComputeData();
+
+                    // 刷新畫布
+                    doc.NewSolution(false);
+
+                    // 返回結果
+                    result = new
+                    {
+                        success = true,
+                        message = "Connection created successfully",
+                        sourceId = connection.Source.ComponentId,
+                        targetId = connection.Target.ComponentId,
+                        sourceParam = sourceParameter.Name,
+                        targetParam = targetParameter.Name,
+                        sourceType = sourceParameter.GetType().Name,
+                        targetType = targetParameter.GetType().Name,
+                        sourceDescription = sourceParameter.Description,
+                        targetDescription = targetParameter.Description
+                    };
+                }
+                catch (Exception ex)
+                {
+                    exception = ex;
+                    RhinoApp.WriteLine($"Error in ConnectComponents: {ex.Message}");
+                }
+            }));
+
+            // 等待 UI 線程操作完成
+            while (result == null && exception == null)
+            {
+                Thread.Sleep(10);
+            }
+
+            // 如果有異常，拋出
+            if (exception != null)
+            {
+                return Response.CreateError($"Error executing command 'connect_components': {exception.Message}");
+            }
+
+            return Response.Ok(result);
+        }
+
+        /// <summary>
+        /// Validate a connection between two components without making it
+        /// </summary>
+        /// <param name="command">Command with the same parameters as connect_components</param>
+        /// <returns>Whether the connection is valid, and the resolved parameters</returns>
+        public static object ValidateConnection(Command command)
+        {
+            var connection = ParseConnection(command, out string parseError);
+            if (connection == null)
+            {
+                throw new ArgumentException(parseError);
+            }
+
+            object result = null;
+            Exception exception = null;
+
+            RhinoApp.InvokeOnUiThread(new Action(() =>
+            {
+                try
+                {
+                    var doc = Instances.ActiveCanvas?.Document;
+                    if (doc == null)
+                    {
+                        exception = new InvalidOperationException("No active Grasshopper document");
+                        return;
+                    }
+
+                    string lookupError = FindParameters(doc, connection, out IGH_Param sourceParameter, out IGH_Param targetParameter);
+                    if (lookupError != null)
+                    {
+                        result = new { valid = false, message = lookupError };
+                        return;
+                    }
+
+                    bool valid = AreParametersCompatible(sourceParameter, targetParameter);
+                    result = new
+                    {
+                        valid,
+                        message = valid
+                            ? "Connection is valid"
+                            : $"Parameters are not compatible: {sourceParameter.GetType().Name} cannot connect to {targetParameter.GetType().Name}",
+                        sourceParam = sourceParameter.Name,
+                        targetParam = targetParameter.Name,
+                        sourceType = sourceParameter.GetType().Name,
+                        targetType = targetParameter.GetType().Name
+                    };
+                }
+                catch (Exception ex)
+                {
+                    exception = ex;
+                    RhinoApp.WriteLine($"Error in ValidateConnection: {ex.Message}");
+                }
+            }));
+
+            // Wait for UI thread operation to complete
+            while (result == null && exception == null)
+            {
+                Thread.Sleep(10);
+            }
+
+            if (exception != null)
+            {
+                throw exception;
+            }
+
+            return result;
+        }
+
+        /// <summary>
+        /// Read the source and target of a connection from command parameters
+        /// </summary>
+        /// <param name="command">Command with sourceId, targetId and optional parameter names or indices</param>
+        /// <param name="error">Error message when the parameters are invalid</param>
+        /// <returns>The connection, or null if the parameters are invalid</returns>
+        private static ConnectionPairing ParseConnection(Command command, out string error)
+        {
+            error = null;
+
             // 獲取源組件 ID
             if (!command.Parameters.TryGetValue("sourceId", out object sourceIdObj) || sourceIdObj == null)
             {
-                return Response.CreateError("Missing required parameter: sourceId");
+                error = "Missing required parameter: sourceId";
+                return null;
             }
             string sourceId = sourceIdObj.ToString();
 
@@ -49,7 +217,8 @@ namespace GH_MCP.Commands
             // 獲取目標組件 ID
             if (!command.Parameters.TryGetValue("targetId", out object targetIdObj) || targetIdObj == null)
             {
-                return Response.CreateError("Missing required parameter: targetId");
+                error = "Missing required parameter: targetId";
+                return null;
             }
             string targetId = targetIdObj.ToString();
 
@@ -93,143 +262,79 @@ namespace GH_MCP.Commands
             // 檢查連接是否有效
             if (!connection.IsValid())
             {
-                return Response.CreateError("Invalid connection parameters");
+                error = "Invalid connection parameters";
+                return null;
             }
 
-            // 在 UI 線程上執行連接操作
-            object result = null;
-            Exception exception = null;
-
-            RhinoApp.InvokeOnUiThread(new Action(() =>
-            {
-                try
-                {
-                    // 獲取當前文檔
-                    var doc = Instances.ActiveCanvas?.Document;
-                    if (doc == null)
-                    {
-                        exception = new InvalidOperationException("No active Grasshopper document");
-                        return;
-                    }
-
-                    // 查找源組件
-                    Guid sourceGuid;
-                    if (!Guid.TryParse(connection.Source.ComponentId, out sourceGuid))
-                    {
-                        exception = new ArgumentException($"Invalid source component ID: {connection.Source.ComponentId}");
-                        return;
-                    }
-
-                    var sourceComponent = doc.FindObject(sourceGuid, true);
-                    if (sourceComponent == null)
-                    {
-                        exception = new ArgumentException($"Source component not found: {connection.Source.ComponentId}");
-                        return;
-                    }
-
-                    // 查找目標組件
-                    Guid targetGuid;
-                    if (!Guid.TryParse(connection.Target.ComponentId, out targetGuid))
-                    {
-                        exception = new ArgumentException($"Invalid target component ID: {connection.Target.ComponentId}");
-                        return;
-                    }
-
-                    var targetComponent = doc.FindObject(targetGuid, true);
-                    if (targetComponent == null)
-                    {
-                        exception = new ArgumentException($"Target component not found: {connection.Target.ComponentId}");
-                        return;
-                    }
-
-                    // 檢查源組件是否為輸入參數組件
-                    if (sourceComponent is IGH_Param && ((IGH_Param)sourceComponent).Kind == GH_ParamKind.input)
-                    {
-                        exception = new ArgumentException("Source component cannot be an input parameter");
-                        return;
-                    }
-
-                    // 檢查目標組件是否為輸出參數組件
-                    if (targetComponent is IGH_Param && ((IGH_Param)targetComponent).Kind == GH_ParamKind.output)
-                    {
-                        exception = new ArgumentException("Target component cannot be an output parameter");
-                        return;
-                    }
-
-                    // 獲取源參數
-                    IGH_Param sourceParameter = GetParameter(sourceComponent, connection.Source, false);
-                    if (sourceParameter == null)
-                    {
-                        exception = new ArgumentException($"Source parameter not found: {connection.Source.ParameterName ?? connection.Source.ParameterIndex.ToString()}");
-                        return;
-                    }
+            return connection;
+        }
 
-                    // 獲取目標參數
-                    IGH_Param targetParameter = GetParameter(targetComponent, connection.Target, true);
-                    if (targetParameter == null)
-                    {
-                        exception = new ArgumentException($"Target parameter not found: {connection.Target.ParameterName ?? connection.Target.ParameterIndex.ToString()}");
-                        return;
-                    }
+        /// <summary>
+        /// Find the source and target parameters of a connection in a document
+        /// </summary>
+        /// <param name="doc">Document</param>
+        /// <param name="connection">Connection</param>
+        /// <param name="sourceParameter">Resolved source parameter</param>
+        /// <param name="targetParameter">Resolved target parameter</param>
+        /// <returns>Error message, or null if both parameters were found</returns>
+        private static string FindParameters(GH_Document doc, ConnectionPairing connection, out IGH_Param sourceParameter, out IGH_Param targetParameter)
+        {
+            sourceParameter = null;
+            targetParameter = null;
 
-                    // 檢查參數類型相容性
-                    if (!AreParametersCompatible(sourceParameter, targetParameter))
-                    {
-                        exception = new ArgumentException($"Parameters are not compatible: {sourceParameter.GetType().Name} cannot connect to {targetParameter.GetType().Name}");
-                        return;
-                    }
+            // 查找源組件
+            Guid sourceGuid;
+            if (!Guid.TryParse(connection.Source.ComponentId, out sourceGuid))
+            {
+                return $"Invalid source component ID: {connection.Source.ComponentId}";
+            }
 
-                    // 移除現有連接（如果需要）
-                    if (targetParameter.SourceCount > 0)
-                    {
-                        targetParameter.RemoveAllSources();
-                    }
+            var sourceComponent = doc.FindObject(sourceGuid, true);
+            if (sourceComponent == null)
+            {
+                return $"Source component not found: {connection.Source.ComponentId}";
+            }
 
-                    // 連接參數
-                    targetParameter.AddSource(sourceParameter);
+            // 查找目標組件
+            Guid targetGuid;
+            if (!Guid.TryParse(connection.Target.ComponentId, out targetGuid))
+            {
+                return $"Invalid target component ID: {connection.Target.ComponentId}";
+            }
 
-                    // 刷新數據
-                    targetParameter.CollectData();
-                    targetParameter.ComputeData();
+            var targetComponent = doc.FindObject(targetGuid, true);
+            if (targetComponent == null)
+            {
+                return $"Target component not found: {connection.Target.ComponentId}";
+            }
 
-                    // 刷新畫布
-                    doc.NewSolution(false);
+            // 檢查源組件是否為輸入參數組件
+            if (sourceComponent is IGH_Param && ((IGH_Param)sourceComponent).Kind == GH_ParamKind.input)
+            {
+                return "Source component cannot be an input parameter";
+            }
 
-                    // 返回結果
-                    result = new
-                    {
-                        success = true,
-                        message = "Connection created successfully",
-                        sourceId = connection.Source.ComponentId,
-                        targetId = connection.Target.ComponentId,
-                        sourceParam = sourceParameter.Name,
-                        targetParam = targetParameter.Name,
-                        sourceType = sourceParameter.GetType().Name,
-                        targetType = targetParameter.GetType().Name,
-                        sourceDescription = sourceParameter.Description,
-                        targetDescription = targetParameter.Description
-                    };
-                }
-                catch (Exception ex)
-                {
-                    exception = ex;
-                    RhinoApp.WriteLine($"Error in ConnectComponents: {ex.Message}");
-                }
-            }));
+            // 檢查目標組件是否為輸出參數組件
+            if (targetComponent is IGH_Param && ((IGH_Param)targetComponent).Kind == GH_ParamKind.output)
+            {
+                return "Target component cannot be an output parameter";
+            }
 
-            // 等待 UI 線程操作完成
-            while (result == null && exception == null)
+            // 獲取源參數
+            sourceParameter = GetParameter(sourceComponent, connection.Source, false);
+            if (sourceParameter == null)
             {
-                Thread.Sleep(10);
+                return $"Source parameter not found: {connection.Source.ParameterName ?? connection.Source.ParameterIndex.ToString()}";
             }
 
-            // 如果有異常，拋出
-            if (exception != null)
+            // 獲取目標參數
+            targetParameter = GetParameter(targetComponent, connection.Target, true);
+            if (targetParameter == null)
             {
-                return Response.CreateError($"Error executing command 'connect_components': {exception.Message}");
+                return $"Target parameter not found: {connection.Target.ParameterName ?? connection.Target.ParameterIndex.ToString()}";
             }
 
-            return Response.Ok(result);
+            return null;
         }
 
         /// <summary>
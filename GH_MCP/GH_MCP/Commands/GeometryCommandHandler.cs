@@ -1,6 +1,12 @@
 using System;
 using System.Collections.Generic;
+using System.Threading;
 using GrasshopperMCP.Models;
+using Grasshopper.Kernel;
+using Grasshopper.Kernel.Data;
+using Grasshopper.Kernel.Parameters;
+using Grasshopper.Kernel.Types;
+using Rhino;
 using Rhino.Geometry;
 using Newtonsoft.Json.Linq;
 
@@ -121,5 +127,238 @@ namespace GrasshopperMCP.Commands
                 circumference = circle.Circumference
             };
         }
+
+        /// <summary>
+        /// Create points in bulk
+        /// </summary>
+        /// <param name="command">Command containing flat "coordinates" [x0, y0, z0, x1, ...] and optional canvas "x", "y"</param>
+        /// <returns>ID of the Point parameter holding the points, and the point count</returns>
+        public static object CreatePoints(Command command)
+        {
+            double[] coordinates = GetDoubleArray(command, "coordinates");
+            if (coordinates == null || coordinates.Length == 0 || coordinates.Length % 3 != 0)
+            {
+                throw new ArgumentException("Coordinates must be a non-empty multiple of 3 values");
+            }
+
+            int count = coordinates.Length / 3;
+            var points = new List<GH_Point>(count);
+            for (int i = 0; i < count; i++)
+            {
+                Point3d point = new Point3d(coordinates[3 * i], coordinates[3 * i + 1], coordinates[3 * i + 2]);
+                if (!point.IsValid)
+                {
+                    throw new ArgumentException($"Point {i} is invalid");
+                }
+                points.Add(new GH_Point(point));
+            }
+
+            Guid id = AddInternalizedParam(new Param_Point(), points, "Points", command);
+
+            return new
+            {
+                id = id.ToString(),
+                count
+            };
+        }
+
+        /// <summary>
+        /// Create polylines in bulk
+        /// </summary>
+        /// <param name="command">Command containing flat vertex "coordinates", per-polyline vertex "counts" and optional canvas "x", "y"</param>
+        /// <returns>ID of the Curve parameter holding the polylines, the polyline count and their lengths</returns>
+        public static object CreatePolylines(Command command)
+        {
+            double[] coordinates = GetDoubleArray(command, "coordinates");
+            var countsData = command.GetParameter<JArray>("counts");
+
+            if (coordinates == null || coordinates.Length % 3 != 0)
+            {
+                throw new ArgumentException("Coordinates must be a multiple of 3 values");
+            }
+            if (countsData == null || countsData.Count == 0)
+            {
+                throw new ArgumentException("Vertex counts are required");
+            }
+
+            int[] counts = countsData.ToObject<int[]>();
+            var curves = new List<GH_Curve>(counts.Length);
+            var lengths = new double[counts.Length];
+            int offset = 0;
+            for (int i = 0; i < counts.Length; i++)
+            {
+                if (counts[i] < 2)
+                {
+                    throw new ArgumentException($"Polyline {i} needs at least 2 vertices");
+                }
+                if ((offset + counts[i]) * 3 > coordinates.Length)
+                {
+                    throw new ArgumentException("Vertex counts exceed the number of coordinates");
+                }
+
+                var polyline = new Polyline(counts[i]);
+                for (int j = 0; j < counts[i]; j++, offset++)
+                {
+                    polyline.Add(coordinates[3 * offset], coordinates[3 * offset + 1], coordinates[3 * offset + 2]);
+                }
+
+                curves.Add(new GH_Curve(new PolylineCurve(polyline)));
+                lengths[i] = polyline.Length;
+            }
+
+            if (offset * 3 != coordinates.Length)
+            {
+                throw new ArgumentException("Vertex counts do not match the number of coordinates");
+            }
+
+            Guid id = AddInternalizedParam(new Param_Curve(), curves, "Polylines", command);
+
+            return new
+            {
+                id = id.ToString(),
+                count = counts.Length,
+                lengths
+            };
+        }
+
+        /// <summary>
+        /// Create circles in bulk
+        /// </summary>
+        /// <param name="command">Command containing flat "centers", "radii" (one per circle, or one for all) and optional canvas "x", "y"</param>
+        /// <returns>ID of the Circle parameter holding the circles, and the circle count</returns>
+        public static object CreateCircles(Command command)
+        {
+            double[] centers = GetDoubleArray(command, "centers");
+            double[] radii = GetDoubleArray(command, "radii");
+
+            if (centers == null || centers.Length == 0 || centers.Length % 3 != 0)
+            {
+                throw new ArgumentException("Centers must be a non-empty multiple of 3 values");
+            }
+
+            int count = centers.Length / 3;
+            if (radii == null || (radii.Length != 1 && radii.Length != count))
+            {
+                throw new ArgumentException("Radii must contain one value or one value per circle");
+            }
+
+            var circles = new List<GH_Circle>(count);
+            for (int i = 0; i < count; i++)
+            {
+                double radius = radii.Length == 1 ? radii[0] : radii[i];
+                if (radius <= 0)
+                {
+                    throw new ArgumentException($"Radius of circle {i} must be greater than 0");
+                }
+
+                Circle circle = new Circle(new Point3d(centers[3 * i], centers[3 * i + 1], centers[3 * i + 2]), radius);
+                if (!circle.IsValid)
+                {
+                    throw new ArgumentException($"Circle {i} is invalid");
+                }
+                circles.Add(new GH_Circle(circle));
+            }
+
+            Guid id = AddInternalizedParam(new Param_Circle(), circles, "Circles", command);
+
+            return new
+            {
+                id = id.ToString(),
+                count
+            };
+        }
+
+        /// <summary>
+        /// Add a floating parameter with internalized data to the active document
+        /// </summary>
+        /// <param name="param">New parameter</param>
+        /// <param name="items">Data to internalize, as one list</param>
+        /// <param name="nickName">Parameter nickname</param>
+        /// <param name="command">Command with optional canvas position "x", "y"</param>
+        /// <returns>Instance GUID of the added parameter</returns>
+        private static Guid AddInternalizedParam<T>(GH_PersistentParam<T> param, List<T> items, string nickName, Command command)
+            where T : class, IGH_Goo
+        {
+            float x = (float)command.GetParameter<double>("x");
+            float y = (float)command.GetParameter<double>("y");
+
+            Guid? result = null;
+            Exception exception = null;
+
+            // Execute on UI thread
+            RhinoApp.InvokeOnUiThread(new Action(() =>
+            {
+                try
+                {
+                    GH_Document doc = Grasshopper.Instances.ActiveCanvas?.Document;
+                    if (doc == null)
+                    {
+                        throw new InvalidOperationException("No active Grasshopper document");
+                    }
+
+                    param.NickName = nickName;
+                    param.PersistentData.AppendRange(items, new GH_Path(0));
+                    param.CreateAttributes();
+                    param.Attributes.Pivot = new System.Drawing.PointF(x, y);
+
+                    doc.AddObject(param, false);
+                    doc.NewSolution(false);
+
+                    result = param.InstanceGuid;
+                }
+                catch (Exception ex)
+                {
+                    exception = ex;
+                    RhinoApp.WriteLine($"Error adding {nickName}: {ex.Message}");
+                }
+            }));
+
+            // Wait for UI thread operation to complete
+            while (result == null && exception == null)
+            {
+                Thread.Sleep(10);
+            }
+
+            if (exception != null)
+            {
+                throw exception;
+            }
+
+            return result.Value;
+        }
+
+        /// <summary>
+        /// Read a double array sent either as a JSON array or as base64 little-endian float64
+        /// </summary>
+        /// <param name="command">Command</param>
+        /// <param name="name">Parameter name</param>
+        /// <returns>The values, or null if the parameter is missing</returns>
+        private static double[] GetDoubleArray(Command command, string name)
+        {
+            if (!command.Parameters.TryGetValue(name, out object value) || value == null)
+            {
+                return null;
+            }
+
+            if (value is string packed)
+            {
+                byte[] bytes = Convert.FromBase64String(packed);
+                if (bytes.Length % sizeof(double) != 0)
+                {
+                    throw new ArgumentException($"Packed parameter '{name}' is not a float64 array");
+                }
+
+                var values = new double[bytes.Length / sizeof(double)];
+                Buffer.BlockCopy(bytes, 0, values, 0, bytes.Length);
+                return values;
+            }
+
+            if (value is JArray array)
+            {
+                return array.ToObject<double[]>();
+            }
+
+            throw new ArgumentException($"Parameter '{name}' must be an array or a base64 string");
+        }
     }
 }
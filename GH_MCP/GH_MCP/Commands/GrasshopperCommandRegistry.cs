@@ -4,6 +4,7 @@ using GrasshopperMCP.Models;
 using GrasshopperMCP.Commands;
 using Rhino;
 using System.Linq;
+using Newtonsoft.Json.Linq;
 
 namespace GH_MCP.Commands
 {
@@ -32,6 +33,9 @@ namespace GH_MCP.Commands
             // Register intent commands
             RegisterIntentCommands();
 
+            // Register batch commands
+            RegisterBatchCommands();
+
             RhinoApp.WriteLine("GH_MCP: Command registry initialized.");
         }
 
@@ -48,6 +52,11 @@ namespace GH_MCP.Commands
 
             // Create circle
             RegisterCommand("create_circle", GeometryCommandHandler.CreateCircle);
+
+            // Create geometry in bulk
+            RegisterCommand("create_points", GeometryCommandHandler.CreatePoints);
+            RegisterCommand("create_polylines", GeometryCommandHandler.CreatePolylines);
+            RegisterCommand("create_circles", GeometryCommandHandler.CreateCircles);
         }
 
         /// <summary>
@@ -61,6 +70,9 @@ namespace GH_MCP.Commands
             // Connect components
             RegisterCommand("connect_components", ConnectionCommandHandler.ConnectComponents);
 
+            // Validate a connection without making it
+            RegisterCommand("validate_connection", ConnectionCommandHandler.ValidateConnection);
+
             // Set component value
             RegisterCommand("set_component_value", ComponentCommandHandler.SetComponentValue);
 
@@ -100,6 +112,50 @@ namespace GH_MCP.Commands
             RhinoApp.WriteLine("GH_MCP: Intent commands registered.");
         }
 
+        /// <summary>
+        /// Register batch commands
+        /// </summary>
+        private static void RegisterBatchCommands()
+        {
+            // Execute several commands in order over a single request
+            RegisterCommand("execute_batch", ExecuteBatch);
+        }
+
+        /// <summary>
+        /// Execute a list of commands in order and collect their responses
+        /// </summary>
+        /// <param name="command">Command containing a "commands" array of {type, parameters}</param>
+        /// <returns>List of responses, one per sub-command</returns>
+        private static object ExecuteBatch(Command command)
+        {
+            var commandsData = command.GetParameter<JArray>("commands");
+            if (commandsData == null)
+            {
+                throw new ArgumentException("Parameter 'commands' is required");
+            }
+
+            var responses = new List<Response>();
+            foreach (var commandData in commandsData)
+            {
+                var subCommand = commandData.ToObject<Command>();
+                if (subCommand != null && subCommand.Parameters == null)
+                {
+                    subCommand.Parameters = new Dictionary<string, object>();
+                }
+
+                // Nested batches are not allowed
+                if (subCommand?.Type == "execute_batch")
+                {
+                    responses.Add(Response.CreateError("Nested execute_batch is not supported"));
+                    continue;
+                }
+
+                responses.Add(ExecuteCommand(subCommand));
+            }
+
+            return responses;
+        }
+
         /// <summary>
         /// Register command handler
         /// </summary>
@@ -139,6 +195,12 @@ namespace GH_MCP.Commands
                 try
                 {
                     var result = handler(command);
+
+                    // Handlers that build their own response are not wrapped again
+                    if (result is Response response)
+                    {
+                        return response;
+                    }
                     return Response.Ok(result);
                 }
                 catch (Exception ex)
@@ -6,6 +6,7 @@ using System.Net.Sockets;
 using System.Text;
 using System.Threading.Tasks;
 using GH_MCP.Commands;
+using GH_MCP.Utils;
 using GrasshopperMCP.Models;
 using Grasshopper.Kernel;
 using Rhino;
@@ -22,6 +23,7 @@ namespace GrasshopperMCP
         private static TcpListener listener;
         private static bool isRunning = false;
         private static int grasshopperPort = 8080;
+        private const int MaxLastCommandLength = 1000;
 
         public GrasshopperMCPComponent()
             : base("Grasshopper MCP", "MCP", "Machine Control Protocol for Grasshopper", "Params", "Util")
@@ -94,6 +96,9 @@ namespace GrasshopperMCP
             // Initialize command registry
             GrasshopperCommandRegistry.Initialize();
 
+            // Publish document changes to subscribers
+            ChangeNotifier.Initialize();
+
             // Start TCP listener
             isRunning = true;
             listener = new TcpListener(IPAddress.Loopback, grasshopperPort);
@@ -143,6 +148,44 @@ namespace GrasshopperMCP
             }
         }
 
+        /// <summary>
+        /// Stream change events to a subscribed client until it disconnects
+        /// </summary>
+        /// <param name="reader">Client reader, used to detect disconnection</param>
+        /// <param name="writer">Client writer</param>
+        private static async Task StreamChanges(StreamReader reader, StreamWriter writer)
+        {
+            var subscription = ChangeNotifier.Subscribe();
+            RhinoApp.WriteLine("GrasshopperMCPBridge: Change subscriber connected.");
+
+            try
+            {
+                await writer.WriteLineAsync(JsonConvert.SerializeObject(Response.Ok(new { subscribed = true })));
+
+                // The subscriber never sends again, so this completes when it disconnects
+                Task<string> disconnected = reader.ReadLineAsync();
+
+                while (isRunning)
+                {
+                    Task ready = subscription.WaitAsync();
+                    if (await Task.WhenAny(ready, disconnected) == disconnected)
+                    {
+                        break;
+                    }
+
+                    while (subscription.TryDequeue(out string eventJson))
+                    {
+                        await writer.WriteLineAsync(eventJson);
+                    }
+                }
+            }
+            finally
+            {
+                ChangeNotifier.Unsubscribe(subscription);
+                RhinoApp.WriteLine("GrasshopperMCPBridge: Change subscriber disconnected.");
+            }
+        }
+
         /// <summary>
         /// Handle client connection
         /// </summary>
@@ -154,39 +197,51 @@ namespace GrasshopperMCP
             using (var reader = new StreamReader(stream, Encoding.UTF8))
             using (var writer = new StreamWriter(stream, Encoding.UTF8) { AutoFlush = true })
             {
-                try
+                // Commands are newline-delimited; a client may send several over one connection
+                string commandJson;
+                while ((commandJson = await reader.ReadLineAsync()) != null)
                 {
-                    // Read command
-                    string commandJson = await reader.ReadLineAsync();
                     if (string.IsNullOrEmpty(commandJson))
                     {
-                        return;
+                        continue;
                     }
 
-                    // Update last received command
-                    LastCommand = commandJson;
-
-                    // Parse command
-                    Command command = JsonConvert.DeserializeObject<Command>(commandJson);
-                    RhinoApp.WriteLine($"GrasshopperMCPBridge: Received command: {command.Type}");
-
-                    // Execute command
-                    Response response = GrasshopperCommandRegistry.ExecuteCommand(command);
-
-                    // Send response
-                    string responseJson = JsonConvert.SerializeObject(response);
-                    await writer.WriteLineAsync(responseJson);
-
-                    RhinoApp.WriteLine($"GrasshopperMCPBridge: Command {command.Type} executed with result: {(response.Success ? "Success" : "Error")}");
-                }
-                catch (Exception ex)
-                {
-                    RhinoApp.WriteLine($"GrasshopperMCPBridge error handling client: {ex.Message}");
+                    try
+                    {
+                        // Update last received command (bulk payloads can be megabytes long)
+                        LastCommand = commandJson.Length > MaxLastCommandLength
+                            ? commandJson.Substring(0, MaxLastCommandLength) + "..."
+                            : commandJson;
+
+                        // Parse command
+                        Command command = JsonConvert.DeserializeObject<Command>(commandJson);
+                        RhinoApp.WriteLine($"GrasshopperMCPBridge: Received command: {command.Type}");
+
+                        // Subscriptions keep the connection open and stream change events
+                        if (command.Type == "subscribe")
+                        {
+                            await StreamChanges(reader, writer);
+                            return;
+                        }
+
+                        // Execute command
+                        Response response = GrasshopperCommandRegistry.ExecuteCommand(command);
+
+                        // Send response
+                        string responseJson = JsonConvert.SerializeObject(response);
+                        await writer.WriteLineAsync(responseJson);
+
+                        RhinoApp.WriteLine($"GrasshopperMCPBridge: Command {command.Type} executed with result: {(response.Success ? "Success" : "Error")}");
+                    }
+                    catch (Exception ex)
+                    {
+                        RhinoApp.WriteLine($"GrasshopperMCPBridge error handling client: {ex.Message}");
 
-                    // Send error response
-                    var errorResponse = Response.CreateError($"Server error: {ex.Message}");
-                    string errorResponseJson = JsonConvert.SerializeObject(errorResponse);
-                    await writer.WriteLineAsync(errorResponseJson);
+                        // Send error response
+                        var errorResponse = Response.CreateError($"Server error: {ex.Message}");
+                        string errorResponseJson = JsonConvert.SerializeObject(errorResponse);
+                        await writer.WriteLineAsync(errorResponseJson);
+                    }
                 }
             }
         }
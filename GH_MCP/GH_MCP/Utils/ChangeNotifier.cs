@@ -0,0 +1,290 @@
+using System;
+using System.Collections.Concurrent;
+using System.Collections.Generic;
+using System.Linq;
+using System.Threading;
+using System.Threading.Tasks;
+using Grasshopper.Kernel;
+using Newtonsoft.Json;
+using Rhino;
+
+namespace GH_MCP.Utils
+{
+    /// <summary>
+    /// Publishes compact change events of the active Grasshopper document to subscribers
+    /// </summary>
+    public static class ChangeNotifier
+    {
+        // Events buffered per subscriber before it is considered too slow
+        private const int MaxQueuedEvents = 1000;
+
+        private static readonly object SyncRoot = new object();
+        private static readonly List<Subscription> Subscriptions = new List<Subscription>();
+        private static readonly HashSet<IGH_Param> WatchedParams = new HashSet<IGH_Param>();
+        private static GH_Document attachedDocument;
+        private static bool canvasHooked = false;
+        private static long sequence = 0;
+
+        /// <summary>
+        /// A subscriber's queue of serialized events
+        /// </summary>
+        public class Subscription
+        {
+            private readonly ConcurrentQueue<string> events = new ConcurrentQueue<string>();
+            private readonly SemaphoreSlim signal = new SemaphoreSlim(0);
+            private int overflowed = 0;
+
+            internal void Enqueue(string eventJson)
+            {
+                if (events.Count >= MaxQueuedEvents)
+                {
+                    // Drop events and tell the subscriber to resynchronize once
+                    if (Interlocked.Exchange(ref overflowed, 1) == 0)
+                    {
+                        events.Enqueue(Serialize(new { @event = "overflow" }));
+                        signal.Release();
+                    }
+                    return;
+                }
+
+                events.Enqueue(eventJson);
+                signal.Release();
+            }
+
+            /// <summary>
+            /// Wait until at least one event is available
+            /// </summary>
+            public Task WaitAsync()
+            {
+                return signal.WaitAsync();
+            }
+
+            /// <summary>
+            /// Take the next queued event
+            /// </summary>
+            public bool TryDequeue(out string eventJson)
+            {
+                bool dequeued = events.TryDequeue(out eventJson);
+                if (events.IsEmpty)
+                {
+                    Interlocked.Exchange(ref overflowed, 0);
+                }
+                return dequeued;
+            }
+        }
+
+        /// <summary>
+        /// Hook the active canvas so that document events are published
+        /// </summary>
+        public static void Initialize()
+        {
+            RhinoApp.InvokeOnUiThread(new Action(() =>
+            {
+                var canvas = Grasshopper.Instances.ActiveCanvas;
+                if (canvas == null)
+                {
+                    RhinoApp.WriteLine("GH_MCP: No active canvas, change notifications disabled.");
+                    return;
+                }
+
+                if (!canvasHooked)
+                {
+                    canvas.DocumentChanged += OnDocumentChanged;
+                    canvasHooked = true;
+                }
+
+                AttachDocument(canvas.Document);
+            }));
+        }
+
+        /// <summary>
+        /// Register a new subscriber
+        /// </summary>
+        public static Subscription Subscribe()
+        {
+            var subscription = new Subscription();
+            lock (SyncRoot)
+            {
+                Subscriptions.Add(subscription);
+            }
+            return subscription;
+        }
+
+        /// <summary>
+        /// Remove a subscriber
+        /// </summary>
+        public static void Unsubscribe(Subscription subscription)
+        {
+            lock (SyncRoot)
+            {
+                Subscriptions.Remove(subscription);
+            }
+        }
+
+        private static void OnDocumentChanged(Grasshopper.GUI.Canvas.GH_Canvas sender, Grasshopper.GUI.Canvas.GH_CanvasDocumentChangedEventArgs e)
+        {
+            AttachDocument(e.NewDocument);
+            Publish(new { @event = "document_changed" });
+        }
+
+        private static void AttachDocument(GH_Document document)
+        {
+            if (attachedDocument == document)
+            {
+                return;
+            }
+
+            if (attachedDocument != null)
+            {
+                attachedDocument.ObjectsAdded -= OnObjectsAdded;
+                attachedDocument.ObjectsDeleted -= OnObjectsDeleted;
+                attachedDocument.SolutionEnd -= OnSolutionEnd;
+                foreach (var param in WatchedParams.ToList())
+                {
+                    UnwatchParam(param);
+                }
+            }
+
+            attachedDocument = document;
+            if (document == null)
+            {
+                return;
+            }
+
+            document.ObjectsAdded += OnObjectsAdded;
+            document.ObjectsDeleted += OnObjectsDeleted;
+            document.SolutionEnd += OnSolutionEnd;
+            foreach (var obj in document.Objects)
+            {
+                WatchObject(obj);
+            }
+        }
+
+        private static void OnObjectsAdded(object sender, GH_DocObjectEventArgs e)
+        {
+            foreach (var obj in e.Objects)
+            {
+                WatchObject(obj);
+            }
+
+            Publish(new
+            {
+                @event = "objects_added",
+                objects = e.Objects.Select(obj => new
+                {
+                    id = obj.InstanceGuid.ToString(),
+                    type = obj.GetType().Name,
+                    name = obj.NickName
+                }).ToList()
+            });
+        }
+
+        private static void OnObjectsDeleted(object sender, GH_DocObjectEventArgs e)
+        {
+            foreach (var obj in e.Objects)
+            {
+                foreach (var param in GetInputParams(obj))
+                {
+                    UnwatchParam(param);
+                }
+            }
+
+            Publish(new
+            {
+                @event = "objects_removed",
+                ids = e.Objects.Select(obj => obj.InstanceGuid.ToString()).ToList()
+            });
+        }
+
+        private static void OnSolutionEnd(object sender, GH_SolutionEventArgs e)
+        {
+            Publish(new
+            {
+                @event = "solution_completed",
+                objectCount = (sender as GH_Document)?.ObjectCount ?? 0
+            });
+        }
+
+        private static void OnParamChanged(IGH_DocumentObject sender, GH_ObjectChangedEventArgs e)
+        {
+            // Only source (wire) changes are published; other changes arrive as solutions
+            if (e.Type != GH_ObjectEventType.Sources || !(sender is IGH_Param param))
+            {
+                return;
+            }
+
+            var owner = param.Attributes?.GetTopLevel?.DocObject ?? param;
+            Publish(new
+            {
+                @event = "wire_changed",
+                componentId = owner.InstanceGuid.ToString(),
+                paramId = param.InstanceGuid.ToString(),
+                paramName = param.Name,
+                sourceIds = param.Sources.Select(source =>
+                    (source.Attributes?.GetTopLevel?.DocObject ?? source).InstanceGuid.ToString()).ToList()
+            });
+        }
+
+        private static IEnumerable<IGH_Param> GetInputParams(IGH_DocumentObject obj)
+        {
+            if (obj is IGH_Component component)
+            {
+                return component.Params.Input;
+            }
+            if (obj is IGH_Param param)
+            {
+                return new[] { param };
+            }
+            return Enumerable.Empty<IGH_Param>();
+        }
+
+        private static void WatchObject(IGH_DocumentObject obj)
+        {
+            foreach (var param in GetInputParams(obj))
+            {
+                if (WatchedParams.Add(param))
+                {
+                    param.ObjectChanged += OnParamChanged;
+                }
+            }
+        }
+
+        private static void UnwatchParam(IGH_Param param)
+        {
+            if (WatchedParams.Remove(param))
+            {
+                param.ObjectChanged -= OnParamChanged;
+            }
+        }
+
+        private static void Publish(object change)
+        {
+            List<Subscription> subscribers;
+            long seq;
+            lock (SyncRoot)
+            {
+                if (Subscriptions.Count == 0)
+                {
+                    return;
+                }
+                subscribers = Subscriptions.ToList();
+                seq = ++sequence;
+            }
+
+            // Add the sequence number without a second anonymous type per event
+            var payload = Newtonsoft.Json.Linq.JObject.FromObject(change);
+            payload["seq"] = seq;
+            string eventJson = payload.ToString(Formatting.None);
+
+            foreach (var subscriber in subscribers)
+            {
+                subscriber.Enqueue(eventJson);
+            }
+        }
+
+        private static string Serialize(object value)
+        {
+            return JsonConvert.SerializeObject(value, Formatting.None);
+        }
+    }
+}
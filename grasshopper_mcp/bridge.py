@@ -1,32 +1,101 @@
+import asyncio
+import atexit
+import contextvars
+import functools
 import json
+import os
 import socket
 import sys
+import threading
 import traceback
-from typing import Any
-
-# Use MCP server
-from mcp.server.fastmcp import FastMCP
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+from .compatibility import CompatibilityMatrix, validate_edges
+from .events import CanvasTracker, ChangeSubscriber
+from .geometry import (
+    CHUNK_SPACING,
+    POINT_BYTES,
+    chunk_polylines,
+    chunk_ranges,
+    collect_chunks,
+    encode,
+    pack_counts,
+    pack_points,
+    pack_values,
+)
+from .journal import (
+    FSYNC_POLICIES,
+    Journal,
+    replay_state,
+    response_data,
+    unwrap_response,
+)
+from .knowledge import asset_path, load_asset
+from .scheduler import DEFAULT_SESSION, all_metrics, get_scheduler, is_read_command
+
+if TYPE_CHECKING:
+    from mcp.server.fastmcp import FastMCP
+    from pydantic import AnyUrl
 
 # Set Grasshopper MCP connection parameters
 GRASSHOPPER_HOST = "localhost"
 GRASSHOPPER_PORT = 8080  # Default port, can be modified as needed
-
-# Create MCP server
-server = FastMCP("Grasshopper Bridge")
+MAX_CONCURRENT_READS = 4  # Read commands allowed in flight per instance
+
+# Mutation journal parameters, used to recover the canvas after a crash. Each
+# Grasshopper instance (host:port) gets its own subdirectory.
+JOURNAL_DIR = os.environ.get(
+    "GRASSHOPPER_MCP_JOURNAL_DIR",
+    os.path.join(os.path.expanduser("~"), ".grasshopper_mcp", "journal"),
+)
+JOURNAL_FSYNC = os.environ.get("GRASSHOPPER_MCP_JOURNAL_FSYNC", "interval")
+if JOURNAL_FSYNC not in FSYNC_POLICIES:
+    print(
+        f"Warning: Invalid GRASSHOPPER_MCP_JOURNAL_FSYNC '{JOURNAL_FSYNC}', "
+        f"expected one of {FSYNC_POLICIES}. Using 'interval'.",
+        file=sys.stderr,
+    )
+    JOURNAL_FSYNC = "interval"
+JOURNAL_SNAPSHOT_INTERVAL = 200  # Journal entries between snapshots
+REPLAY_BATCH_SIZE = 100  # Commands per execute_batch request during replay
+
+# MCP server, created by create_server() so that importing the bridge (and
+# --help or --profile-startup) does not import the MCP SDK
+server: "FastMCP | None" = None
+
+# Tools and resources registered with the server when it is created
+_tools: list[tuple[str, Any]] = []
+_resources: list[tuple[str, Any]] = []
+
+# Create mutation journal
+journal = Journal(
+    os.path.join(JOURNAL_DIR, f"{GRASSHOPPER_HOST}_{GRASSHOPPER_PORT}"),
+    fsync=JOURNAL_FSYNC,
+    snapshot_interval=JOURNAL_SNAPSHOT_INTERVAL,
+)
+atexit.register(journal.flush)
+
+# Track canvas changes pushed by the Grasshopper listener
+STATUS_URI = "grasshopper://status"
+canvas_tracker = CanvasTracker()
+
+# Sessions to notify when the status resource changes, with their event loops
+_status_watchers: dict[int, tuple[Any, asyncio.AbstractEventLoop]] = {}
+_status_watchers_lock = threading.Lock()
+
+# Last status resource, valid while the tracker is live at the same version
+_status_cache: dict[str, Any] = {"version": None, "status": None}
 
 
 def load_component_mapping():
     """Load component mapping from external JSON file"""
     try:
-        import os
-
         # Get the path to the component mapping JSON file
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        json_file_path = os.path.join(current_dir, "component_mapping.json")
+        json_file_path = asset_path("component_mapping.json")
 
-        # Read the JSON file
-        with open(json_file_path, encoding="utf-8") as f:
-            return json.load(f)
+        # Parsed once per process
+        return load_asset("component_mapping.json")
     except FileNotFoundError:
         print(
             f"Warning: component_mapping.json not found at {json_file_path}. Using fallback data.",
@@ -50,10 +119,129 @@ def load_component_mapping():
         return {"slider": "Number Slider", "panel": "Panel", "add": "Addition"}
 
 
+def current_session() -> str:
+    """Return an identifier for the MCP session of the current request"""
+    if server is None:
+        return DEFAULT_SESSION
+    try:
+        return str(id(server.get_context().session))
+    except (LookupError, ValueError):
+        return DEFAULT_SESSION
+
+
+def _in_worker_thread(fn):
+    """Wrap a synchronous function in a coroutine that runs it in a worker thread"""
+
+    import anyio
+
+    @functools.wraps(fn)
+    async def run_in_thread(*args, **kwargs):
+        return await anyio.to_thread.run_sync(functools.partial(fn, *args, **kwargs))
+
+    return run_in_thread
+
+
+def grasshopper_tool(name: str):
+    """
+    Register a synchronous tool that runs in a worker thread
+
+    FastMCP calls synchronous tools directly on its event loop, which would
+    serialize every tool call. Running them in worker threads lets the command
+    scheduler overlap reads. The undecorated function is returned so it can
+    still be called directly.
+    """
+
+    def decorator(fn):
+        _tools.append((name, fn))
+        return fn
+
+    return decorator
+
+
+def grasshopper_resource(uri: str):
+    """
+    Register a synchronous resource that runs in a worker thread
+
+    Resources may wait in the command scheduler behind other sessions' writes,
+    which must not block the event loop. The undecorated function is returned.
+    """
+
+    def decorator(fn):
+        _resources.append((uri, fn))
+        return fn
+
+    return decorator
+
+
+def watch_status():
+    """Notify the current session when the status resource changes"""
+    if server is None:
+        return
+    try:
+        session = server.get_context().session
+        loop = asyncio.get_running_loop()
+    except (LookupError, ValueError, RuntimeError):
+        return
+    with _status_watchers_lock:
+        _status_watchers[id(session)] = (session, loop)
+
+
+def unwatch_status():
+    """Stop notifying the current session about status changes"""
+    if server is None:
+        return
+    try:
+        session = server.get_context().session
+    except (LookupError, ValueError):
+        return
+    with _status_watchers_lock:
+        _status_watchers.pop(id(session), None)
+
+
+async def _send_status_updated(session):
+    from pydantic import AnyUrl
+
+    try:
+        await session.send_resource_updated(AnyUrl(STATUS_URI))
+    except Exception:
+        # The session has gone away
+        with _status_watchers_lock:
+            _status_watchers.pop(id(session), None)
+
+
+def handle_change_event(event: dict[str, Any]):
+    """Apply a change event pushed by Grasshopper and notify watching sessions"""
+    if not canvas_tracker.apply(event):
+        return
+    with _status_watchers_lock:
+        watchers = list(_status_watchers.values())
+    for session, loop in watchers:
+        if not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(_send_status_updated(session), loop)
+
+
+change_subscriber = ChangeSubscriber(
+    GRASSHOPPER_HOST, GRASSHOPPER_PORT, on_event=handle_change_event
+)
+
+
+def invalidate_status(command_type: str, response: dict[str, Any]):
+    """Drop the cached status resource after a command changed the document"""
+    # The listener may not push change events (or may push them late), so the
+    # tracker version alone cannot tell that a write made the cache stale
+    if not is_read_command(command_type) and unwrap_response(response).get("success"):
+        _status_cache.update(version=None, status=None)
+
+
 def send_to_grasshopper(
-    command_type: str, params: dict[str, Any] | None = None
+    command_type: str, params: dict[str, Any] | None = None, record: bool = True
 ) -> dict[str, Any]:
-    """Send command to Grasshopper MCP"""
+    """
+    Send command to Grasshopper MCP
+
+    Successful mutating commands are recorded in the mutation journal unless
+    ``record`` is False.
+    """
     if params is None:
         params = {}
 
@@ -66,32 +254,42 @@ def send_to_grasshopper(
             file=sys.stderr,
         )
 
-        # Connect to Grasshopper MCP
-        client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        client.connect((GRASSHOPPER_HOST, GRASSHOPPER_PORT))
-
-        # Send command
-        command_json = json.dumps(command)
-        client.sendall((command_json + "\n").encode("utf-8"))
-        print(f"Command sent: {command_json}", file=sys.stderr)
-
-        # Receive response
-        response_data = b""
-        while True:
-            chunk = client.recv(4096)
-            if not chunk:
-                break
-            response_data += chunk
-            if response_data.endswith(b"\n"):
-                break
-
-        # Handle possible BOM
-        response_str = response_data.decode("utf-8-sig").strip()
-        print(f"Response received: {response_str}", file=sys.stderr)
-
-        # Parse JSON response
-        response = json.loads(response_str)
-        client.close()
+        # Wait for the scheduler: reads run concurrently, writes in order
+        scheduler = get_scheduler(
+            GRASSHOPPER_HOST, GRASSHOPPER_PORT, MAX_CONCURRENT_READS
+        )
+        with scheduler.slot(command_type, current_session()):
+            # Connect to Grasshopper MCP
+            client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            client.connect((GRASSHOPPER_HOST, GRASSHOPPER_PORT))
+
+            # Send command
+            command_json = json.dumps(command)
+            client.sendall((command_json + "\n").encode("utf-8"))
+            print(f"Command sent: {command_json}", file=sys.stderr)
+
+            # Receive response
+            response_data = b""
+            while True:
+                chunk = client.recv(4096)
+                if not chunk:
+                    break
+                response_data += chunk
+                if response_data.endswith(b"\n"):
+                    break
+
+            # Handle possible BOM
+            response_str = response_data.decode("utf-8-sig").strip()
+            print(f"Response received: {response_str}", file=sys.stderr)
+
+            # Parse JSON response
+            response = json.loads(response_str)
+            client.close()
+
+            # Record successful mutations (buffered, written off the calling thread)
+            if record:
+                journal.record(command_type, params, response)
+            invalidate_status(command_type, response)
         return response
     except Exception as e:
         print(f"Error communicating with Grasshopper: {str(e)}", file=sys.stderr)
@@ -102,8 +300,106 @@ def send_to_grasshopper(
         }
 
 
+def send_commands_to_grasshopper(
+    commands: list[tuple[str, dict[str, Any]]],
+) -> list[dict[str, Any]]:
+    """Send several commands over one connection, returning responses in order"""
+    responses: list[dict[str, Any]] = []
+    scheduler = get_scheduler(GRASSHOPPER_HOST, GRASSHOPPER_PORT, MAX_CONCURRENT_READS)
+    session = current_session()
+
+    try:
+        client = socket.create_connection((GRASSHOPPER_HOST, GRASSHOPPER_PORT))
+        with client, client.makefile("rb") as stream:
+            for command_type, params in commands:
+                command_json = json.dumps({"type": command_type, "parameters": params})
+                # Payloads can be megabytes, so only log their size
+                print(
+                    f"Sending command to Grasshopper: {command_type} "
+                    f"({len(command_json)} bytes)",
+                    file=sys.stderr,
+                )
+
+                with scheduler.slot(command_type, session):
+                    client.sendall((command_json + "\n").encode("utf-8"))
+                    line = stream.readline()
+                    if not line:
+                        raise ConnectionError("Connection closed by Grasshopper")
+                    response = json.loads(line.decode("utf-8-sig"))
+                    journal.record(command_type, params, response)
+                    invalidate_status(command_type, response)
+
+                responses.append(response)
+    except Exception as e:
+        print(f"Error communicating with Grasshopper: {str(e)}", file=sys.stderr)
+        traceback.print_exc(file=sys.stderr)
+        error = {
+            "success": False,
+            "error": f"Error communicating with Grasshopper: {str(e)}",
+        }
+        responses.extend([error] * (len(commands) - len(responses)))
+
+    return responses
+
+
+def connection_params(
+    source_id: str,
+    target_id: str,
+    source_param: str | None = None,
+    target_param: str | None = None,
+    source_param_index: int | None = None,
+    target_param_index: int | None = None,
+) -> dict[str, Any]:
+    """Build connect_components parameters (names take precedence over indices)"""
+    params = {"sourceId": source_id, "targetId": target_id}
+
+    if source_param is not None:
+        params["sourceParam"] = source_param
+    elif source_param_index is not None:
+        params["sourceParamIndex"] = str(source_param_index)
+
+    if target_param is not None:
+        params["targetParam"] = target_param
+    elif target_param_index is not None:
+        params["targetParamIndex"] = str(target_param_index)
+
+    return params
+
+
+@functools.lru_cache(maxsize=1)
+def get_compatibility_matrix() -> CompatibilityMatrix:
+    """Build the data-type compatibility matrix from the component library once"""
+    return CompatibilityMatrix(get_component_library())
+
+
+def resolve_component_types(component_ids: set[str]) -> dict[str, str]:
+    """
+    Resolve component types for validation
+
+    Types recorded in the mutation journal are used first; any remaining IDs
+    are looked up with a single get_document_info call.
+    """
+    component_types = journal.component_types()
+    if component_ids <= component_types.keys():
+        return component_types
+
+    matrix = get_compatibility_matrix()
+    doc_info = send_to_grasshopper("get_document_info")
+    data = response_data(doc_info) or {}
+    for component in data.get("components", []):
+        component_id = component.get("id")
+        if component_id in component_ids and component_id not in component_types:
+            # Canvas types are class names (e.g. GH_NumberSlider); fall back to
+            # the nickname
+            component_type = component.get("type", "")
+            if matrix.find_component(component_type) is None:
+                component_type = component.get("name", component_type)
+            component_types[component_id] = component_type
+    return component_types
+
+
 # Register MCP tools
-@server.tool("add_component")
+@grasshopper_tool("add_component")
 def add_component(component_type: str, x: float, y: float):
     """
     Add a component to the Grasshopper canvas
@@ -133,13 +429,13 @@ def add_component(component_type: str, x: float, y: float):
     return send_to_grasshopper("add_component", params)
 
 
-@server.tool("clear_document")
+@grasshopper_tool("clear_document")
 def clear_document():
     """Clear the Grasshopper document"""
     return send_to_grasshopper("clear_document")
 
 
-@server.tool("save_document")
+@grasshopper_tool("save_document")
 def save_document(path: str):
     """
     Save the Grasshopper document
@@ -155,7 +451,7 @@ def save_document(path: str):
     return send_to_grasshopper("save_document", params)
 
 
-@server.tool("load_document")
+@grasshopper_tool("load_document")
 def load_document(path: str):
     """
     Load a Grasshopper document
@@ -171,13 +467,13 @@ def load_document(path: str):
     return send_to_grasshopper("load_document", params)
 
 
-@server.tool("get_document_info")
+@grasshopper_tool("get_document_info")
 def get_document_info():
     """Get information about the Grasshopper document"""
     return send_to_grasshopper("get_document_info")
 
 
-@server.tool("connect_components")
+@grasshopper_tool("connect_components")
 def connect_components(
     source_id: str,
     target_id: str,
@@ -242,22 +538,169 @@ def connect_components(
                 else:
                     target_param = "A"  # Otherwise connect to the first input
 
-    params = {"sourceId": source_id, "targetId": target_id}
+    params = connection_params(
+        source_id,
+        target_id,
+        source_param,
+        target_param,
+        source_param_index,
+        target_param_index,
+    )
 
-    if source_param is not None:
-        params["sourceParam"] = source_param
-    elif source_param_index is not None:
-        params["sourceParamIndex"] = str(source_param_index)
+    return send_to_grasshopper("connect_components", params)
 
-    if target_param is not None:
-        params["targetParam"] = target_param
-    elif target_param_index is not None:
-        params["targetParamIndex"] = str(target_param_index)
 
-    return send_to_grasshopper("connect_components", params)
+@grasshopper_tool("set_component_value")
+def set_component_value(component_id: str, value: str):
+    """
+    Set the value of a component (e.g. a Number Slider, Panel or Boolean Toggle)
+
+    Args:
+        component_id: ID of the component
+        value: New value, as a string
+
+    Returns:
+        Result of setting the value
+    """
+    params = {"id": component_id, "value": value}
+
+    return send_to_grasshopper("set_component_value", params)
+
+
+@grasshopper_tool("create_points")
+def create_points(
+    coordinates: list[float] | list[list[float]], x: float = 0, y: float = 0
+):
+    """
+    Create many points in one call
+
+    The points are internalized in Point parameters on the canvas, one per
+    chunk sent, stacked downwards from the given canvas position.
+
+    Args:
+        coordinates: Flat list [x0, y0, z0, x1, ...] or list of [x, y] / [x, y, z]
+            points (NumPy arrays are accepted when called from Python)
+        x: X coordinate of the first parameter on the canvas
+        y: Y coordinate of the first parameter on the canvas
+
+    Returns:
+        Number of created points, and the ID and point range of each parameter
+    """
+    try:
+        flat, count = pack_points(coordinates)
+    except ValueError as e:
+        return {"success": False, "error": str(e)}
+
+    ranges = chunk_ranges(count, POINT_BYTES)
+    commands = [
+        (
+            "create_points",
+            {
+                "coordinates": encode(flat[3 * start : 3 * stop]),
+                "x": x,
+                "y": y + i * CHUNK_SPACING,
+            },
+        )
+        for i, (start, stop) in enumerate(ranges)
+    ]
+    return collect_chunks(ranges, send_commands_to_grasshopper(commands))
+
+
+@grasshopper_tool("create_polylines")
+def create_polylines(
+    coordinates: list[float] | list[list[float]],
+    counts: list[int],
+    x: float = 0,
+    y: float = 0,
+):
+    """
+    Create many polylines in one call
+
+    The polylines are internalized in Curve parameters on the canvas, one per
+    chunk sent, stacked downwards from the given canvas position.
+
+    Args:
+        coordinates: Vertices of all polylines, one after another, as a flat list
+            [x0, y0, z0, x1, ...] or list of [x, y] / [x, y, z] points
+        counts: Number of vertices of each polyline (at least 2 each)
+        x: X coordinate of the first parameter on the canvas
+        y: Y coordinate of the first parameter on the canvas
+
+    Returns:
+        Number of created polylines, and the ID and polyline range of each
+        parameter
+    """
+    try:
+        flat, vertex_count = pack_points(coordinates)
+        counts = pack_counts(counts, vertex_count)
+    except ValueError as e:
+        return {"success": False, "error": str(e)}
+
+    chunks = chunk_polylines(counts)
+    commands = [
+        (
+            "create_polylines",
+            {
+                "coordinates": encode(flat[3 * vertex_start : 3 * vertex_stop]),
+                "counts": counts[start:stop],
+                "x": x,
+                "y": y + i * CHUNK_SPACING,
+            },
+        )
+        for i, (start, stop, vertex_start, vertex_stop) in enumerate(chunks)
+    ]
+    ranges = [(start, stop) for start, stop, _, _ in chunks]
+    return collect_chunks(ranges, send_commands_to_grasshopper(commands))
+
+
+@grasshopper_tool("create_circles")
+def create_circles(
+    centers: list[float] | list[list[float]],
+    radii: float | list[float],
+    x: float = 0,
+    y: float = 0,
+):
+    """
+    Create many circles in one call
+
+    The circles are internalized in Circle parameters on the canvas, one per
+    chunk sent, stacked downwards from the given canvas position.
+
+    Args:
+        centers: Circle centers as a flat list [x0, y0, z0, x1, ...] or list of
+            [x, y] / [x, y, z] points
+        radii: One radius for all circles, or one radius per circle
+        x: X coordinate of the first parameter on the canvas
+        y: Y coordinate of the first parameter on the canvas
+
+    Returns:
+        Number of created circles, and the ID and circle range of each parameter
+    """
+    try:
+        flat, count = pack_points(centers, "centers")
+        radii = pack_values(radii, count, "radii")
+    except ValueError as e:
+        return {"success": False, "error": str(e)}
+
+    shared_radius = len(radii) == 1
+    # Each circle sends its center and, unless shared, its radius
+    ranges = chunk_ranges(count, POINT_BYTES + (0 if shared_radius else 8))
+    commands = [
+        (
+            "create_circles",
+            {
+                "centers": encode(flat[3 * start : 3 * stop]),
+                "radii": encode(radii if shared_radius else radii[start:stop]),
+                "x": x,
+                "y": y + i * CHUNK_SPACING,
+            },
+        )
+        for i, (start, stop) in enumerate(ranges)
+    ]
+    return collect_chunks(ranges, send_commands_to_grasshopper(commands))
 
 
-@server.tool("create_pattern")
+@grasshopper_tool("create_pattern")
 def create_pattern(description: str):
     """
     Create a pattern of components based on a high-level description
@@ -273,7 +716,7 @@ def create_pattern(description: str):
     return send_to_grasshopper("create_pattern", params)
 
 
-@server.tool("get_available_patterns")
+@grasshopper_tool("get_available_patterns")
 def get_available_patterns(query: str):
     """
     Get a list of available patterns that match a query
@@ -289,7 +732,7 @@ def get_available_patterns(query: str):
     return send_to_grasshopper("get_available_patterns", params)
 
 
-@server.tool("get_component_info")
+@grasshopper_tool("get_component_info")
 def get_component_info(component_id: str):
     """
     Get detailed information about a specific component
@@ -369,7 +812,7 @@ def get_component_info(component_id: str):
     return result
 
 
-@server.tool("get_all_components")
+@grasshopper_tool("get_all_components")
 def get_all_components():
     """
     Get a list of all components in the current document
@@ -442,7 +885,7 @@ def get_all_components():
     return result
 
 
-@server.tool("get_connections")
+@grasshopper_tool("get_connections")
 def get_connections():
     """
     Get a list of all connections between components in the current document
@@ -453,7 +896,7 @@ def get_connections():
     return send_to_grasshopper("get_connections")
 
 
-@server.tool("search_components")
+@grasshopper_tool("search_components")
 def search_components(query: str):
     """
     Search for components by name or category
@@ -469,7 +912,7 @@ def search_components(query: str):
     return send_to_grasshopper("search_components", params)
 
 
-@server.tool("get_component_parameters")
+@grasshopper_tool("get_component_parameters")
 def get_component_parameters(component_type: str):
     """
     Get a list of parameters for a specific component type
@@ -485,12 +928,14 @@ def get_component_parameters(component_type: str):
     return send_to_grasshopper("get_component_parameters", params)
 
 
-@server.tool("validate_connection")
+@grasshopper_tool("validate_connection")
 def validate_connection(
     source_id: str,
     target_id: str,
     source_param: str | None = None,
     target_param: str | None = None,
+    source_param_index: int | None = None,
+    target_param_index: int | None = None,
 ):
     """
     Validate if a connection between two components is possible
@@ -500,25 +945,145 @@ def validate_connection(
         target_id: ID of the target component (input)
         source_param: Name of the source parameter (optional)
         target_param: Name of the target parameter (optional)
+        source_param_index: Index of the source parameter (optional, used if
+            source_param is not provided)
+        target_param_index: Index of the target parameter (optional, used if
+            target_param is not provided)
 
     Returns:
         Whether the connection is valid and any potential issues
     """
-    params = {"sourceId": source_id, "targetId": target_id}
+    params = connection_params(
+        source_id,
+        target_id,
+        source_param,
+        target_param,
+        source_param_index,
+        target_param_index,
+    )
 
-    if source_param is not None:
-        params["sourceParam"] = source_param
+    return send_to_grasshopper("validate_connection", params)
 
-    if target_param is not None:
-        params["targetParam"] = target_param
 
-    return send_to_grasshopper("validate_connection", params)
+@grasshopper_tool("validate_connections")
+def validate_connections(connections: list[dict[str, Any]]):
+    """
+    Validate many proposed connections at once, before making them
+
+    Each connection is checked locally against the data-type compatibility
+    matrix of the component library. The matrix only knows the compatible and
+    incompatible type pairs the library declares, so the remaining connections
+    are checked by Grasshopper with validate_connection.
+
+    Args:
+        connections: List of connections, each with source_id and target_id and
+            optionally source_param, target_param, source_param_index and
+            target_param_index (same meaning as in connect_components)
+
+    Returns:
+        One verdict per connection, in order, with whether it is valid and why
+    """
+    edges = []
+    for connection in connections:
+        try:
+            edges.append(connection_params(**connection))
+        except TypeError as e:
+            edges.append({"error": f"Invalid connection: {e}"})
+
+    component_ids = {
+        edge[key] for edge in edges for key in ("sourceId", "targetId") if key in edge
+    }
+    verdicts = validate_edges(
+        get_compatibility_matrix(), edges, resolve_component_types(component_ids)
+    )
+
+    for edge, verdict in zip(edges, verdicts, strict=True):
+        if "error" in edge:
+            verdict.update(valid=False, reason=edge["error"])
+
+    # Fall back to Grasshopper for edges the matrix cannot decide; the
+    # scheduler runs these read commands concurrently
+    unresolved = [v for v in verdicts if v["valid"] is None]
+    if unresolved:
+
+        def check_remote(verdict):
+            # Edges already hold validate_connection parameters, indices included
+            return send_to_grasshopper("validate_connection", edges[verdict["index"]])
+
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_READS) as executor:
+            futures = [
+                executor.submit(contextvars.copy_context().run, check_remote, verdict)
+                for verdict in unresolved
+            ]
+            for verdict, future in zip(unresolved, futures, strict=True):
+                response = unwrap_response(future.result())
+                verdict["checkedBy"] = "remote"
+                if not response.get("success", False):
+                    verdict["reason"] = response.get("error") or verdict["reason"]
+                    continue
+                data = response_data(response) or {}
+                if not isinstance(data.get("valid"), bool):
+                    verdict["reason"] = "Grasshopper did not report a verdict"
+                    continue
+                verdict["valid"] = data["valid"]
+                verdict["reason"] = data.get("message") or "Validated by Grasshopper"
+
+    return {
+        "success": True,
+        "data": {
+            "verdicts": verdicts,
+            "valid": sum(v["valid"] is True for v in verdicts),
+            "invalid": sum(v["valid"] is False for v in verdicts),
+            "unknown": sum(v["valid"] is None for v in verdicts),
+        },
+    }
+
+
+@grasshopper_tool("replay")
+def replay(clear_first: bool = False):
+    """
+    Rebuild the journaled canvas state on a fresh Grasshopper instance
+
+    Components, values and connections recorded in the mutation journal are
+    recreated with batched commands. Old component IDs are remapped to the new
+    ones, and the journal is rewritten with the new IDs. If any command fails
+    the journal is left untouched so nothing recorded is lost. Values and
+    connections of components the journal never recorded (e.g. from
+    load_document) cannot be remapped; they are reported as skipped and
+    dropped from the rewritten journal.
+
+    Args:
+        clear_first: Clear the current document before replaying
+
+    Returns:
+        Number of restored components, values and connections, any errors,
+        skipped commands, and the mapping from old to new component IDs
+    """
+    state = journal.load_state()
+
+    if clear_first:
+        # Not journaled: clearing would otherwise erase the state being replayed
+        cleared = send_to_grasshopper("clear_document", record=False)
+        if not cleared.get("success", False):
+            return cleared
+
+    result = replay_state(state, send_to_grasshopper, batch_size=REPLAY_BATCH_SIZE)
+    new_state = result.pop("state")
+    if not result["errors"]:
+        journal.reset(new_state)
+
+    return {"success": not result["errors"], "data": result}
 
 
 # Register MCP resources
-@server.resource("grasshopper://status")
+@grasshopper_resource(STATUS_URI)
 def get_grasshopper_status():
     """Get Grasshopper status"""
+    # Reuse the last status while change events show the canvas is unchanged
+    version = canvas_tracker.version
+    if not canvas_tracker.stale and _status_cache["version"] == version:
+        return _status_cache["status"]
+
     try:
         # Get document information
         doc_info = send_to_grasshopper("get_document_info")
@@ -604,7 +1169,7 @@ def get_grasshopper_status():
 
             component_summaries.append(summary)
 
-        return {
+        status = {
             "status": "Connected to Grasshopper",
             "document": doc_info.get("result", {}),
             "components": component_summaries,
@@ -617,7 +1182,10 @@ def get_grasshopper_status():
                 "When connecting multiple sliders to Addition, first slider goes to input A, second to input B",
             ],
             "canvas_summary": f"Current canvas has {len(component_summaries)} components and {len(connections.get('result', []))} connections",
+            "changes": canvas_tracker.summary(),
         }
+        _status_cache.update(version=version, status=status)
+        return status
     except Exception as e:
         print(f"Error getting Grasshopper status: {str(e)}", file=sys.stderr)
         traceback.print_exc(file=sys.stderr)
@@ -629,20 +1197,33 @@ def get_grasshopper_status():
         }
 
 
-@server.resource("grasshopper://component_guide")
+async def subscribe_resource(uri: "AnyUrl"):
+    """Register the session for resource-updated notifications"""
+    if str(uri) == STATUS_URI:
+        watch_status()
+
+
+async def unsubscribe_resource(uri: "AnyUrl"):
+    """Unregister the session from resource-updated notifications"""
+    if str(uri) == STATUS_URI:
+        unwatch_status()
+
+
+@grasshopper_resource("grasshopper://metrics")
+def get_bridge_metrics():
+    """Get bridge metrics, including command scheduler queue depth"""
+    return {"scheduler": all_metrics()}
+
+
+@grasshopper_resource("grasshopper://component_guide")
 def get_component_guide():
     """Get guide for Grasshopper components and connections"""
     try:
-        import json
-        import os
-
         # Get the path to the component guide JSON file
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        json_file_path = os.path.join(current_dir, "component_guide.json")
+        json_file_path = asset_path("component_guide.json")
 
-        # Read the JSON file
-        with open(json_file_path, encoding="utf-8") as f:
-            return json.load(f)
+        # Parsed once per process
+        return load_asset("component_guide.json")
     except FileNotFoundError:
         print(
             f"Warning: component_guide.json not found at {json_file_path}. Using fallback data.",
@@ -687,21 +1268,16 @@ def get_component_guide():
         }
 
 
-@server.resource("grasshopper://component_library")
+@grasshopper_resource("grasshopper://component_library")
 def get_component_library():
     """Get a comprehensive library of Grasshopper components"""
     # This resource provides a more comprehensive component library with detailed information for common components
     try:
-        import json
-        import os
-
         # Get the path to the component library JSON file
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        json_file_path = os.path.join(current_dir, "component_library.json")
+        json_file_path = asset_path("component_library.json")
 
-        # Read the JSON file
-        with open(json_file_path, encoding="utf-8") as f:
-            return json.load(f)
+        # Parsed once per process
+        return load_asset("component_library.json")
     except FileNotFoundError:
         print(
             f"Warning: component_library.json not found at {json_file_path}. Using fallback data.",
@@ -725,13 +1301,50 @@ def get_component_library():
         return {"categories": [], "dataTypes": []}
 
 
+def create_server() -> "FastMCP":
+    """Create the MCP server and register the bridge's tools and resources"""
+    global server
+    from mcp.server.fastmcp import FastMCP
+
+    server = FastMCP("Grasshopper Bridge")
+    for name, fn in _tools:
+        server.tool(name)(_in_worker_thread(fn))
+    for uri, fn in _resources:
+        server.resource(uri)(_in_worker_thread(fn))
+    server._mcp_server.subscribe_resource()(subscribe_resource)
+    server._mcp_server.unsubscribe_resource()(unsubscribe_resource)
+    return server
+
+
 def main():
     """Main entry point for the Grasshopper MCP Bridge Server"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Grasshopper MCP Bridge Server")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Print an import and initialization timing breakdown as JSON and exit",
+    )
+    args = parser.parse_args()
+
+    if args.profile_startup:
+        from .startup import profile_startup
+
+        # Pass this module: under "python -m" it is __main__, and importing
+        # grasshopper_mcp.bridge again would create a second bridge
+        print(json.dumps(profile_startup(sys.modules[__name__]), indent=2))
+        return
+
     try:
         # Start MCP server
         print("Starting Grasshopper MCP Bridge Server...", file=sys.stderr)
         print("Please add this MCP server to Claude Desktop", file=sys.stderr)
-        server.run()
+
+        # Keep bridge state current from Grasshopper change events
+        change_subscriber.start()
+
+        create_server().run()
     except Exception as e:
         print(f"Error starting MCP server: {str(e)}", file=sys.stderr)
         traceback.print_exc(file=sys.stderr)
@@ -0,0 +1,234 @@
+"""
+Local connection validation with a data-type compatibility matrix.
+
+The matrix is built once from the component library: every ``dataTypes``
+entry and every parameter type becomes a row/column. Rows are source types:
+a type's ``compatibleWith`` list marks the target types it can feed and its
+``incompatibleWith`` list the ones it cannot, and ``Any`` accepts everything.
+Declarations are directional; the reverse pair stays undecided unless the other
+type declares it. A list of proposed edges is then checked with one indexed
+lookup into the matrix.
+
+``compatibleWith`` lists are short alias lists, not Grasshopper's cast table
+(e.g. a Point input also accepts a Plane's origin), so a pair that is not
+declared either way is left undecided for Grasshopper to check. So are edges
+whose component or parameter types are unknown.
+"""
+
+import re
+from collections.abc import Sequence
+from typing import Any
+
+from .optional import numpy
+
+WILDCARD_TYPE = "any"
+UNKNOWN = -1
+
+# Matrix cells
+COMPATIBLE = 1
+UNDECIDED = 0
+INCOMPATIBLE = -1
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a component or type name (e.g. "GH_NumberSlider" -> "number slider")"""
+    name = re.sub(r"^(GH_|Component_)", "", name or "")
+    name = re.sub(r"(?<=[a-z0-9])(?=[A-Z])", " ", name)
+    return " ".join(name.lower().replace("_", " ").split())
+
+
+class CompatibilityMatrix:
+    """Source-type x target-type matrix of COMPATIBLE/UNDECIDED/INCOMPATIBLE"""
+
+    def __init__(self, library: dict[str, Any]):
+        data_types = library.get("dataTypes", [])
+        self.components: dict[str, dict[str, Any]] = {}
+
+        names: list[str] = []
+        for data_type in data_types:
+            names.append(data_type.get("name", ""))
+            names.extend(data_type.get("compatibleWith", []))
+            names.extend(data_type.get("incompatibleWith", []))
+        for category in library.get("categories", []):
+            for component in category.get("components", []):
+                for key in ("name", "fullName"):
+                    if component.get(key):
+                        self.components[normalize_name(component[key])] = component
+                for param in component.get("inputs", []) + component.get("outputs", []):
+                    names.append(param.get("type", ""))
+
+        self.index: dict[str, int] = {}
+        for name in names:
+            key = normalize_name(name)
+            if key and key not in self.index:
+                self.index[key] = len(self.index)
+        self.types = list(self.index)
+
+        size = len(self.types)
+        matrix = [
+            [COMPATIBLE if i == j else UNDECIDED for j in range(size)]
+            for i in range(size)
+        ]
+        for data_type in data_types:
+            i = self.index.get(normalize_name(data_type.get("name", "")))
+            if i is None:
+                continue
+            for key, cell in (
+                ("incompatibleWith", INCOMPATIBLE),
+                ("compatibleWith", COMPATIBLE),
+            ):
+                for other in data_type.get(key, []):
+                    j = self.index[normalize_name(other)]
+                    matrix[i][j] = cell
+        wildcard = self.index.get(WILDCARD_TYPE)
+        if wildcard is not None:
+            for i in range(size):
+                matrix[i][wildcard] = matrix[wildcard][i] = COMPATIBLE
+
+        np = numpy()
+        self.matrix = np.array(matrix, dtype=np.int8) if np is not None else matrix
+
+    def type_index(self, type_name: str | None) -> int:
+        """Return the matrix index of a data type, or UNKNOWN"""
+        return self.index.get(normalize_name(type_name or ""), UNKNOWN)
+
+    def find_component(self, component_type: str | None) -> dict[str, Any] | None:
+        """Return the library entry of a component type, if known"""
+        return self.components.get(normalize_name(component_type or ""))
+
+    def check(self, sources: Sequence[int], targets: Sequence[int]) -> list[int]:
+        """Look up the cells of many (source, target) type index pairs at once"""
+        if not sources:
+            return []
+        np = numpy()
+        if np is not None:
+            return self.matrix[
+                np.asarray(sources, dtype=np.intp), np.asarray(targets, dtype=np.intp)
+            ].tolist()
+        return [self.matrix[s][t] for s, t in zip(sources, targets, strict=True)]
+
+
+def _find_param(
+    params: list[dict[str, Any]], name: str | None, index: int | str | None
+) -> dict[str, Any] | None:
+    if name is not None:
+        key = name.lower()
+        for param in params:
+            if param.get("name", "").lower() == key:
+                return param
+        return None
+    if index is not None:
+        index = int(index)
+        return params[index] if 0 <= index < len(params) else None
+    return None
+
+
+def validate_edges(
+    matrix: CompatibilityMatrix,
+    edges: Sequence[dict[str, Any]],
+    component_types: dict[str, str],
+) -> list[dict[str, Any]]:
+    """
+    Validate proposed connections against the compatibility matrix
+
+    Args:
+        matrix: Compatibility matrix
+        edges: Edges with sourceId/targetId and optional sourceParam,
+            targetParam, sourceParamIndex, targetParamIndex
+        component_types: Component type per component ID
+
+    Returns:
+        One verdict per edge: {"valid", "reason", ...}. ``valid`` is False only
+        when the knowledge base declares the types incompatible, and None when
+        the matrix cannot decide and a remote check is needed.
+    """
+    verdicts: list[dict[str, Any]] = []
+    # Flattened (edge, candidate input) pairs; a target without an explicit
+    # parameter is valid if any of its inputs accepts the source
+    pair_edges: list[int] = []
+    pair_sources: list[int] = []
+    pair_targets: list[int] = []
+    pair_inputs: list[dict[str, Any]] = []
+    # Edges with at least one candidate input the matrix cannot decide
+    unresolved: set[int] = set()
+
+    for i, edge in enumerate(edges):
+        verdict = {"index": i, "valid": None, "reason": "", "checkedBy": "matrix"}
+        verdicts.append(verdict)
+
+        source = matrix.find_component(component_types.get(edge.get("sourceId")))
+        target = matrix.find_component(component_types.get(edge.get("targetId")))
+        if source is None or target is None:
+            verdict["reason"] = "Component type not in knowledge base"
+            continue
+
+        # Parameter names the library does not know may still be matched by the
+        # listener's fuzzy matching, so they are left to the remote check
+        outputs = source.get("outputs", [])
+        if edge.get("sourceParam") is None and edge.get("sourceParamIndex") is None:
+            source_param = outputs[0] if outputs else None
+        else:
+            source_param = _find_param(
+                outputs, edge.get("sourceParam"), edge.get("sourceParamIndex")
+            )
+        if source_param is None:
+            verdict["reason"] = (
+                f"Output not found in knowledge base for {source['name']}"
+            )
+            continue
+
+        inputs = target.get("inputs", [])
+        if edge.get("targetParam") is None and edge.get("targetParamIndex") is None:
+            candidates = inputs
+        else:
+            target_param = _find_param(
+                inputs, edge.get("targetParam"), edge.get("targetParamIndex")
+            )
+            candidates = [target_param] if target_param is not None else []
+        if not candidates:
+            verdict["reason"] = (
+                f"Input not found in knowledge base for {target['name']}"
+            )
+            continue
+
+        verdict["sourceType"] = source_param.get("type")
+        source_index = matrix.type_index(source_param.get("type"))
+        for candidate in candidates:
+            target_index = matrix.type_index(candidate.get("type"))
+            if source_index == UNKNOWN or target_index == UNKNOWN:
+                unresolved.add(i)
+                continue
+            pair_edges.append(i)
+            pair_sources.append(source_index)
+            pair_targets.append(target_index)
+            pair_inputs.append(candidate)
+
+    for i, cell, candidate in zip(
+        pair_edges, matrix.check(pair_sources, pair_targets), pair_inputs, strict=True
+    ):
+        verdict = verdicts[i]
+        target_type = candidate.get("type")
+        if cell == COMPATIBLE and not verdict["valid"]:
+            verdict["valid"] = True
+            verdict["targetParam"] = candidate.get("name")
+            verdict["targetType"] = target_type
+            verdict["reason"] = (
+                f"{verdict['sourceType']} is compatible with {target_type}"
+            )
+        elif cell == UNDECIDED:
+            unresolved.add(i)
+        elif cell == INCOMPATIBLE and verdict["valid"] is None:
+            verdict["valid"] = False
+            verdict["targetType"] = target_type
+            verdict["reason"] = (
+                f"{verdict['sourceType']} is declared incompatible with {target_type}"
+            )
+
+    for verdict in verdicts:
+        # An input the matrix cannot decide might still accept the source
+        if verdict["valid"] is False and verdict["index"] in unresolved:
+            verdict["valid"] = None
+        if verdict["valid"] is None and verdict["index"] in unresolved:
+            verdict["reason"] = "No compatibility rule in knowledge base"
+
+    return verdicts
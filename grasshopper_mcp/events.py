@@ -0,0 +1,189 @@
+"""
+Change-notification consumer for the Grasshopper listener.
+
+``ChangeSubscriber`` keeps a long-lived ``subscribe`` connection to the
+listener open on a background thread and hands every pushed event (one JSON
+object per line) to a callback, reconnecting with backoff when the listener
+goes away. ``CanvasTracker`` folds those events into a small view of the
+canvas so callers can tell whether a cached document dump is still current.
+"""
+
+import json
+import socket
+import sys
+import threading
+from collections.abc import Callable
+from typing import Any
+
+# Synthetic events emitted by the subscriber itself. Events may have been
+# missed while disconnected, so consumers should treat both as "resync".
+CONNECTED_EVENT = "connected"
+DISCONNECTED_EVENT = "disconnected"
+
+# Events that mean the consumer's view can no longer be trusted
+RESYNC_EVENTS = {CONNECTED_EVENT, DISCONNECTED_EVENT, "overflow", "document_changed"}
+
+
+class ChangeSubscriber:
+    """Background reader of the listener's change-event stream"""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        on_event: Callable[[dict[str, Any]], None],
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 30.0,
+    ):
+        self.host = host
+        self.port = port
+        self.on_event = on_event
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+
+        self._stop = threading.Event()
+        self._socket: socket.socket | None = None
+        self._thread: threading.Thread | None = None
+        self.connected = False
+
+    def start(self):
+        """Start consuming events on a daemon thread"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="grasshopper-events", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None):
+        """Stop consuming events and close the connection"""
+        self._stop.set()
+        client = self._socket
+        if client is not None:
+            try:
+                client.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        delay = self.reconnect_delay
+        reported_failure = False
+
+        while not self._stop.is_set():
+            try:
+                self._consume()
+                delay = self.reconnect_delay
+                reported_failure = False
+            except (OSError, ValueError) as e:
+                # Report only the first failure in a row to avoid log spam while
+                # Grasshopper is not running
+                if not reported_failure:
+                    print(
+                        f"Change subscription unavailable: {str(e)}. Retrying.",
+                        file=sys.stderr,
+                    )
+                    reported_failure = True
+                delay = min(delay * 2, self.max_reconnect_delay)
+
+            if self.connected:
+                self.connected = False
+                self._emit({"event": DISCONNECTED_EVENT})
+
+            self._stop.wait(delay)
+
+    def _consume(self):
+        client = socket.create_connection((self.host, self.port))
+        self._socket = client
+        try:
+            command = {"type": "subscribe", "parameters": {}}
+            client.sendall((json.dumps(command) + "\n").encode("utf-8"))
+
+            stream = client.makefile("rb")
+            ack = json.loads(stream.readline().decode("utf-8-sig") or "{}")
+            if not ack.get("success", False):
+                raise ValueError(ack.get("error") or "subscription rejected")
+
+            self.connected = True
+            print("Subscribed to Grasshopper change events", file=sys.stderr)
+            self._emit({"event": CONNECTED_EVENT})
+
+            for line in stream:
+                if self._stop.is_set():
+                    break
+                line = line.decode("utf-8-sig").strip()
+                if not line:
+                    continue
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    print(f"Warning: Invalid change event: {line}", file=sys.stderr)
+                    continue
+                self._emit(event)
+        finally:
+            self._socket = None
+            client.close()
+
+    def _emit(self, event: dict[str, Any]):
+        try:
+            self.on_event(event)
+        except Exception as e:
+            print(f"Error handling change event: {str(e)}", file=sys.stderr)
+
+
+class CanvasTracker:
+    """Canvas view kept current from change events"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.version = 0
+        self.stale = True
+        self.components: dict[str, dict[str, Any]] = {}
+        self.wires: dict[str, list[str]] = {}
+        self.solutions = 0
+
+    def apply(self, event: dict[str, Any]) -> bool:
+        """
+        Apply a change event
+
+        Returns:
+            True if the event changed the canvas (or invalidated this view)
+        """
+        kind = event.get("event")
+        with self._lock:
+            if kind in RESYNC_EVENTS:
+                self.components.clear()
+                self.wires.clear()
+                # Only a live subscription can keep the view current
+                self.stale = kind != CONNECTED_EVENT
+            elif kind == "objects_added":
+                for obj in event.get("objects", []):
+                    if obj.get("id"):
+                        self.components[obj["id"]] = obj
+            elif kind == "objects_removed":
+                for object_id in event.get("ids", []):
+                    self.components.pop(object_id, None)
+                    self.wires.pop(object_id, None)
+            elif kind == "wire_changed":
+                param_id = event.get("paramId")
+                if param_id:
+                    self.wires[param_id] = list(event.get("sourceIds", []))
+            elif kind == "solution_completed":
+                self.solutions += 1
+            else:
+                return False
+
+            self.version += 1
+            return True
+
+    def summary(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "version": self.version,
+                "live": not self.stale,
+                "componentsAdded": len(self.components),
+                "solutions": self.solutions,
+            }
@@ -0,0 +1,229 @@
+"""
+Validation, packing and chunking for bulk geometry commands.
+
+Coordinates are sent to Grasshopper as base64-encoded little-endian float64
+arrays, which avoids formatting and parsing one JSON number per value. NumPy
+arrays are packed without copying when possible. NumPy is imported on first
+use; without it, the standard ``array`` module is used, so plain Python lists
+work as well.
+"""
+
+import base64
+import math
+import sys
+from array import array
+from collections.abc import Sequence
+from typing import Any
+
+from .journal import response_data
+from .optional import numpy
+
+# Upper bound on the packed coordinate bytes sent in one command
+MAX_CHUNK_BYTES = 1 << 20
+
+POINT_BYTES = 3 * 8
+
+# Vertical canvas spacing between the parameters created for consecutive chunks
+CHUNK_SPACING = 40
+
+
+def _is_ndarray(values: Any) -> bool:
+    np = numpy()
+    return np is not None and isinstance(values, np.ndarray)
+
+
+def _is_point(value: Any) -> bool:
+    return isinstance(value, Sequence) and not isinstance(value, str | bytes)
+
+
+def _as_float64(np: Any, values: Any, name: str) -> Any:
+    """Convert to a float64 NumPy array, accepting what ``array('d')`` accepts"""
+    try:
+        values = np.asarray(values)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be numeric") from None
+    # Strings and objects would be parsed or rejected inconsistently by NumPy
+    if values.size and values.dtype.kind not in "biuf":
+        raise ValueError(f"{name} must be numeric")
+    return values.astype("<f8", copy=False)
+
+
+def pack_points(values: Any, name: str = "coordinates") -> tuple[Any, int]:
+    """
+    Validate points and flatten them to float64 [x0, y0, z0, x1, ...]
+
+    Args:
+        values: Flat list of xyz values, a list of (x, y) or (x, y, z) points,
+            or any NumPy-compatible array of shape (n, 2), (n, 3) or (3n,)
+        name: Parameter name used in error messages
+
+    Returns:
+        The flat float64 values (NumPy array or ``array('d')``) and point count
+    """
+    # Checked up front so NumPy and the fallback reject ragged input alike
+    if isinstance(values, Sequence) and values and _is_point(values[0]):
+        if len({len(point) for point in values}) > 1:
+            raise ValueError(f"{name} must have the same number of values per point")
+
+    np = numpy()
+    if np is not None:
+        points = _as_float64(np, values, name)
+        if points.ndim == 2 and points.shape[1] == 2:
+            points = np.column_stack((points, np.zeros(len(points))))
+        elif points.ndim == 2 and points.shape[1] != 3:
+            raise ValueError(f"{name} must have 2 or 3 values per point")
+        elif points.ndim == 1 and points.size % 3 != 0:
+            raise ValueError(f"{name} must be a multiple of 3 values")
+        elif points.ndim not in (1, 2):
+            raise ValueError(f"{name} must be a flat or (n, 3) array")
+
+        flat = np.ascontiguousarray(points.reshape(-1), dtype="<f8")
+        if not flat.size:
+            raise ValueError(f"{name} must not be empty")
+        if not np.isfinite(flat).all():
+            raise ValueError(f"{name} must be finite numbers")
+        return flat, flat.size // 3
+
+    try:
+        if values and _is_point(values[0]):
+            flat = array("d")
+            for point in values:
+                if len(point) == 2:
+                    flat.extend((point[0], point[1], 0.0))
+                elif len(point) == 3:
+                    flat.extend(point)
+                else:
+                    raise ValueError(f"{name} must have 2 or 3 values per point")
+        else:
+            flat = array("d", values)
+            if len(flat) % 3 != 0:
+                raise ValueError(f"{name} must be a multiple of 3 values")
+    except TypeError:
+        raise ValueError(f"{name} must be numeric") from None
+
+    if not flat:
+        raise ValueError(f"{name} must not be empty")
+    if not all(map(math.isfinite, flat)):
+        raise ValueError(f"{name} must be finite numbers")
+    return flat, len(flat) // 3
+
+
+def pack_values(values: Any, count: int, name: str) -> Any:
+    """Validate one positive value, or one per item, as float64"""
+    if isinstance(values, int | float):
+        values = [values]
+
+    np = numpy()
+    if np is not None:
+        flat = np.ascontiguousarray(_as_float64(np, values, name).reshape(-1))
+        valid = bool(np.isfinite(flat).all() and (flat > 0).all())
+    else:
+        try:
+            flat = array("d", values)
+        except TypeError:
+            raise ValueError(f"{name} must be numeric") from None
+        valid = all(math.isfinite(v) and v > 0 for v in flat)
+
+    if len(flat) not in (1, count):
+        raise ValueError(f"{name} must contain one value or one value per item")
+    if not valid:
+        raise ValueError(f"{name} must be positive finite numbers")
+    return flat
+
+
+def pack_counts(counts: Any, vertex_count: int) -> list[int]:
+    """Validate per-polyline vertex counts against the total vertex count"""
+    if _is_ndarray(counts):
+        np = numpy()
+        if counts.ndim != 1 or (
+            counts.size and not np.issubdtype(counts.dtype, np.integer)
+        ):
+            raise ValueError("counts must be integers")
+        counts = counts.tolist()
+    else:
+        try:
+            counts = list(counts)
+        except TypeError:
+            raise ValueError("counts must be integers") from None
+        # One per polyline, so cheap to check; floats, strings and booleans
+        # are rejected rather than truncated or parsed
+        if not all(isinstance(c, int) and not isinstance(c, bool) for c in counts):
+            raise ValueError("counts must be integers")
+
+    if not counts:
+        raise ValueError("counts must not be empty")
+    if not all(c >= 2 for c in counts):
+        raise ValueError("Every polyline needs at least 2 vertices")
+    total = sum(counts)
+    if total != vertex_count:
+        raise ValueError(
+            f"counts add up to {total} vertices but {vertex_count} were given"
+        )
+    return counts
+
+
+def encode(flat: Any) -> str:
+    """Encode flat float64 values as base64 little-endian bytes"""
+    if _is_ndarray(flat):
+        data = flat.astype("<f8", copy=False).tobytes()
+    else:
+        if sys.byteorder == "big":
+            flat = array("d", flat)
+            flat.byteswap()
+        data = flat.tobytes()
+    return base64.b64encode(data).decode("ascii")
+
+
+def chunk_ranges(count: int, item_bytes: int, max_bytes: int = MAX_CHUNK_BYTES):
+    """Split ``count`` items into [start, stop) ranges of at most ``max_bytes``"""
+    per_chunk = max(1, max_bytes // item_bytes)
+    return [
+        (start, min(start + per_chunk, count)) for start in range(0, count, per_chunk)
+    ]
+
+
+def chunk_polylines(counts: Sequence[int], max_bytes: int = MAX_CHUNK_BYTES):
+    """
+    Group polylines into chunks of at most ``max_bytes`` of vertices
+
+    Returns:
+        (first polyline, end polyline, first vertex, end vertex) per chunk
+    """
+    max_vertices = max(1, max_bytes // POINT_BYTES)
+    chunks = []
+    start = vertex_start = vertices = 0
+    for index, vertex_count in enumerate(counts):
+        if vertices and vertices + vertex_count > max_vertices:
+            chunks.append((start, index, vertex_start, vertex_start + vertices))
+            start, vertex_start, vertices = index, vertex_start + vertices, 0
+        vertices += vertex_count
+    if vertices:
+        chunks.append((start, len(counts), vertex_start, vertex_start + vertices))
+    return chunks
+
+
+def collect_chunks(
+    ranges: Sequence[tuple[int, int]], responses: Sequence[dict[str, Any]]
+) -> dict[str, Any]:
+    """
+    Combine per-chunk responses
+
+    Each chunk's items are held by one parameter on the canvas, so every chunk
+    reports the ID of that parameter and the range of items it holds.
+    """
+    chunks = []
+    errors = []
+    created = 0
+    for (start, stop), response in zip(ranges, responses, strict=True):
+        if not response.get("success", False):
+            errors.append(f"Items {start}-{stop - 1}: {response.get('error')}")
+            continue
+        data = response_data(response) or {}
+        count = data.get("count", 0)
+        created += count
+        chunks.append({"start": start, "count": count, "id": data.get("id")})
+
+    return {
+        "success": not errors,
+        "data": {"count": created, "chunks": chunks, "errors": errors},
+    }
@@ -0,0 +1,552 @@
+"""
+Mutation journal for crash recovery.
+
+Every successful mutating command is appended to a JSON-lines journal by a
+background writer thread, so recording never blocks a tool call. Every
+``snapshot_interval`` entries the writer folds the journal into a compact
+snapshot of the canvas state and truncates the journal. ``replay_state``
+rebuilds that state on a fresh Grasshopper instance with ``execute_batch``
+commands and remaps the recorded GUIDs to the new ones.
+"""
+
+import json
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+# Commands that change the canvas and are recorded in the journal
+JOURNALED_COMMANDS = {
+    "add_component",
+    "connect_components",
+    "set_component_value",
+    "clear_document",
+}
+
+# Parameters that hold component GUIDs and must be remapped on replay
+ID_PARAMS = ("id", "sourceId", "targetId")
+
+# Valid fsync policies: "always" after every write batch, "interval" at most
+# once per flush interval, "never" leaves it to the operating system
+FSYNC_POLICIES = ("always", "interval", "never")
+
+JOURNAL_FILE = "journal.jsonl"
+SNAPSHOT_FILE = "snapshot.json"
+LOCK_FILE = "journal.lock"
+SNAPSHOT_VERSION = 1
+
+_JSON_SEPARATORS = (",", ":")
+
+
+def _is_envelope(value: Any) -> bool:
+    return (
+        isinstance(value, dict)
+        and "success" in value
+        and set(value) <= {"success", "data", "error"}
+    )
+
+
+def unwrap_response(response: dict[str, Any] | None) -> dict[str, Any] | None:
+    """
+    Return the innermost envelope of a Grasshopper response
+
+    Listener builds whose handlers return their own Response wrap it in a
+    second one, e.g. {"success": true, "data": {"success": false, ...}}.
+    """
+    while (
+        isinstance(response, dict)
+        and response.get("success", False)
+        and _is_envelope(response.get("data"))
+    ):
+        response = response["data"]
+    return response
+
+
+def response_data(response: dict[str, Any] | None) -> Any:
+    """Return the payload of a Grasshopper response ("data", or legacy "result")"""
+    response = unwrap_response(response)
+    if not response:
+        return None
+    if "data" in response:
+        return response["data"]
+    return response.get("result")
+
+
+class JournalState:
+    """Materialized canvas state built by folding journal entries"""
+
+    def __init__(self):
+        self.components: dict[str, dict[str, Any]] = {}
+        self.connections: list[dict[str, Any]] = []
+        self.values: dict[str, Any] = {}
+
+    def apply(self, entry: dict[str, Any]):
+        """Apply one journal entry ({"t": type, "p": params, "id": new id})"""
+        command_type = entry.get("t")
+        params = entry.get("p") or {}
+
+        if command_type == "clear_document":
+            self.components.clear()
+            self.connections.clear()
+            self.values.clear()
+        elif command_type == "add_component":
+            component_id = entry.get("id")
+            if component_id:
+                self.components[component_id] = params
+        elif command_type == "connect_components":
+            # Connecting the same pair of parameters twice is a no-op
+            if params not in self.connections:
+                self.connections.append(params)
+        elif command_type == "set_component_value":
+            component_id = params.get("id")
+            if component_id:
+                self.values[component_id] = params.get("value")
+
+    def to_entries(self) -> list[dict[str, Any]]:
+        """Return the minimal ordered list of entries that rebuilds this state"""
+        entries = [
+            {"t": "add_component", "p": params, "id": component_id}
+            for component_id, params in self.components.items()
+        ]
+        entries.extend(
+            entry for entry in self._dependent_entries() if not self._is_orphan(entry)
+        )
+        return entries
+
+    def orphans(self) -> list[dict[str, Any]]:
+        """
+        Return value and connection entries that reference unrecorded components
+
+        Components created outside the journal (e.g. by load_document or
+        create_pattern) cannot be remapped to new IDs, so these are not replayed.
+        """
+        return [entry for entry in self._dependent_entries() if self._is_orphan(entry)]
+
+    def _dependent_entries(self) -> list[dict[str, Any]]:
+        entries = [
+            {"t": "set_component_value", "p": {"id": component_id, "value": value}}
+            for component_id, value in self.values.items()
+        ]
+        entries.extend(
+            {"t": "connect_components", "p": params} for params in self.connections
+        )
+        return entries
+
+    def _is_orphan(self, entry: dict[str, Any]) -> bool:
+        return any(ref not in self.components for ref in _referenced_ids(entry["p"]))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": SNAPSHOT_VERSION,
+            "components": self.components,
+            "connections": self.connections,
+            "values": self.values,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "JournalState":
+        state = cls()
+        if data.get("version") != SNAPSHOT_VERSION:
+            print(
+                f"Warning: Unsupported snapshot version {data.get('version')}. "
+                "Ignoring snapshot.",
+                file=sys.stderr,
+            )
+            return state
+        state.components = dict(data.get("components", {}))
+        state.connections = list(data.get("connections", []))
+        state.values = dict(data.get("values", {}))
+        return state
+
+
+class Journal:
+    """
+    Append-only, buffered on-disk journal of mutating commands
+
+    Several bridge processes may share one directory, since every MCP host
+    session starts its own bridge for the same Grasshopper instance. All file
+    access happens under an inter-process lock and the state is always re-read
+    from disk, so no process can drop entries appended by another.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        fsync: str = "interval",
+        flush_interval: float = 1.0,
+        snapshot_interval: int = 200,
+    ):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(
+                f"Invalid fsync policy '{fsync}', expected one of {FSYNC_POLICIES}"
+            )
+
+        self.directory = directory
+        self.journal_path = os.path.join(directory, JOURNAL_FILE)
+        self.snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        self.lock_path = os.path.join(directory, LOCK_FILE)
+        self.fsync = fsync
+        self.flush_interval = flush_interval
+        self.snapshot_interval = snapshot_interval
+
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._writer: threading.Thread | None = None
+        # Component type per recorded ID, kept current by record() so lookups
+        # never wait for the writer thread; seeded from disk on first use
+        self._types: dict[str, str] | None = None
+        self._types_lock = threading.Lock()
+        self._entries_since_snapshot = 0
+        self._last_fsync = 0.0
+        self._unsynced = False
+
+    def record(
+        self,
+        command_type: str,
+        params: dict[str, Any],
+        response: dict[str, Any] | None,
+    ):
+        """Queue a successful mutating command for the writer thread"""
+        if command_type not in JOURNALED_COMMANDS:
+            return
+        response = unwrap_response(response)
+        if not response or not response.get("success", False):
+            return
+
+        entry = {"t": command_type, "p": params}
+        if command_type == "add_component":
+            data = response_data(response)
+            if not isinstance(data, dict) or not data.get("id"):
+                return
+            entry["id"] = data["id"]
+
+        types = self._component_type_map()
+        with self._types_lock:
+            if command_type == "add_component":
+                types[entry["id"]] = params.get("type", "")
+            elif command_type == "clear_document":
+                types.clear()
+
+        self._ensure_writer()
+        self._queue.put(entry)
+
+    def flush(self):
+        """Block until every queued entry has been written"""
+        if self._writer is not None:
+            self._queue.join()
+
+    def load_state(self) -> JournalState:
+        """Return the current state: last snapshot plus the journal tail"""
+        self.flush()
+        with self._locked():
+            return self._read_state()
+
+    def component_types(self) -> dict[str, str]:
+        """
+        Return the recorded component type of every journaled component ID
+
+        Types are as requested by add_component; Grasshopper's own fuzzy
+        matching may have created a different component.
+        """
+        types = self._component_type_map()
+        with self._types_lock:
+            return dict(types)
+
+    def reset(self, state: JournalState):
+        """Replace snapshot and journal with the given state (e.g. after replay)"""
+        self.flush()
+        with self._locked():
+            self._write_snapshot(state)
+            self._entries_since_snapshot = 0
+        types = _component_types(state)
+        with self._types_lock:
+            self._types = types
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        # The thread lock orders this process's writers; the file lock orders
+        # processes
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with _file_lock(self.lock_path):
+                yield
+
+    def _component_type_map(self) -> dict[str, str]:
+        if self._types is None:
+            with self._locked():
+                if self._types is None:
+                    self._types = _component_types(self._read_state())
+        return self._types
+
+    def _ensure_writer(self):
+        if self._writer is not None:
+            return
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._writer_loop, name="grasshopper-journal", daemon=True
+                )
+                self._writer.start()
+
+    def _writer_loop(self):
+        while True:
+            # Wake up after the flush interval to sync a burst's unsynced tail
+            timeout = self.flush_interval if self._unsynced else None
+            try:
+                entries = [self._queue.get(timeout=timeout)]
+            except queue.Empty:
+                try:
+                    with self._locked():
+                        self._sync_journal()
+                except Exception as e:
+                    print(f"Error syncing mutation journal: {str(e)}", file=sys.stderr)
+                continue
+
+            # Drain everything already queued so a burst becomes one write
+            while True:
+                try:
+                    entries.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                with self._locked():
+                    self._write_entries(entries)
+            except Exception as e:
+                print(f"Error writing mutation journal: {str(e)}", file=sys.stderr)
+                traceback.print_exc(file=sys.stderr)
+            finally:
+                for _ in entries:
+                    self._queue.task_done()
+
+    def _write_entries(self, entries: list[dict[str, Any]]):
+        # Caller holds self._locked()
+        if not entries:
+            return
+
+        data = "".join(
+            json.dumps(entry, separators=_JSON_SEPARATORS) + "\n" for entry in entries
+        ).encode("utf-8")
+
+        with open(self.journal_path, "a+b") as f:
+            # A crash mid-write can leave a partial final line; end it so the
+            # first new entry is not appended to it
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    data = b"\n" + data
+            f.write(data)
+            f.flush()
+
+            now = time.monotonic()
+            if self.fsync == "always" or (
+                self.fsync == "interval"
+                and now - self._last_fsync >= self.flush_interval
+            ):
+                os.fsync(f.fileno())
+                self._last_fsync = now
+                self._unsynced = False
+            elif self.fsync == "interval":
+                self._unsynced = True
+
+        self._entries_since_snapshot += len(entries)
+        if self._entries_since_snapshot >= self.snapshot_interval:
+            # Built from disk, so it includes other processes' entries
+            self._write_snapshot(self._read_state())
+            self._entries_since_snapshot = 0
+
+    def _sync_journal(self):
+        # Caller holds self._locked()
+        if not self._unsynced:
+            return
+        try:
+            with open(self.journal_path, "ab") as f:
+                os.fsync(f.fileno())
+        except FileNotFoundError:
+            pass
+        self._last_fsync = time.monotonic()
+        self._unsynced = False
+
+    def _write_snapshot(self, state: JournalState):
+        # Caller holds self._locked(). Write atomically, then truncate the
+        # journal the snapshot now covers.
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state.to_dict(), f, separators=_JSON_SEPARATORS)
+            f.flush()
+            if self.fsync != "never":
+                os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        open(self.journal_path, "w", encoding="utf-8").close()
+        self._unsynced = False
+
+    def _read_state(self) -> JournalState:
+        # Caller holds self._locked()
+        state = JournalState()
+        try:
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                state = JournalState.from_dict(json.load(f))
+        except FileNotFoundError:
+            pass
+        except json.JSONDecodeError as e:
+            print(
+                f"Warning: Error parsing journal snapshot: {e}. "
+                "Starting from journal only.",
+                file=sys.stderr,
+            )
+
+        try:
+            with open(self.journal_path, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        state.apply(json.loads(line))
+                    except json.JSONDecodeError:
+                        # A torn line from a crash mid-write is expected
+                        print(
+                            "Warning: Skipping corrupt journal entry.",
+                            file=sys.stderr,
+                        )
+        except FileNotFoundError:
+            pass
+
+        return state
+
+
+@contextmanager
+def _file_lock(path: str) -> Iterator[None]:
+    """Hold an exclusive lock on ``path`` that other processes also respect"""
+    with open(path, "a+b") as f:
+        if os.name == "nt":
+            import msvcrt
+
+            f.seek(0)
+            while True:
+                try:
+                    # Retries for about 10 seconds before raising
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _component_types(state: JournalState) -> dict[str, str]:
+    return {
+        component_id: params.get("type", "")
+        for component_id, params in state.components.items()
+    }
+
+
+def _referenced_ids(params: dict[str, Any]) -> list[str]:
+    return [params[key] for key in ID_PARAMS if isinstance(params.get(key), str)]
+
+
+def _remap_ids(params: dict[str, Any], id_map: dict[str, str]) -> dict[str, Any]:
+    remapped = dict(params)
+    for key in ID_PARAMS:
+        if key in remapped and remapped[key] in id_map:
+            remapped[key] = id_map[remapped[key]]
+    return remapped
+
+
+def replay_state(
+    state: JournalState,
+    send: Callable[[str, dict[str, Any] | None], dict[str, Any]],
+    batch_size: int = 100,
+) -> dict[str, Any]:
+    """
+    Rebuild a journal state through ``execute_batch`` commands
+
+    A batch is flushed early whenever the next command references a component
+    created earlier in the same batch, so its new GUID is known before use.
+
+    Values and connections that reference components the journal never
+    recorded are skipped and reported, not counted as errors.
+
+    Returns:
+        Counts, errors, skipped entries, the old-to-new GUID map and the
+        remapped state
+    """
+    id_map: dict[str, str] = {}
+    new_state = JournalState()
+    errors: list[str] = []
+    batches = 0
+    pending: list[dict[str, Any]] = []
+    pending_ids: set[str] = set()
+
+    def flush_pending():
+        nonlocal batches
+        if not pending:
+            return
+        commands = [{"type": entry["t"], "parameters": entry["p"]} for entry in pending]
+        response = unwrap_response(send("execute_batch", {"commands": commands}))
+        batches += 1
+        results = response_data(response)
+        if not response.get("success", False) or not isinstance(results, list):
+            errors.append(response.get("error") or "execute_batch failed")
+            results = [None] * len(pending)
+
+        for entry, result in zip(pending, results, strict=False):
+            result = unwrap_response(result)
+            if not result or not result.get("success", False):
+                if result:
+                    errors.append(f"{entry['t']}: {result.get('error')}")
+                continue
+
+            applied = {"t": entry["t"], "p": entry["p"]}
+            if entry["t"] == "add_component":
+                data = response_data(result)
+                if isinstance(data, dict) and data.get("id"):
+                    id_map[entry["id"]] = data["id"]
+                    applied["id"] = data["id"]
+            new_state.apply(applied)
+
+        pending.clear()
+        pending_ids.clear()
+
+    for entry in state.to_entries():
+        if len(pending) >= batch_size or any(
+            ref in pending_ids for ref in _referenced_ids(entry["p"])
+        ):
+            flush_pending()
+
+        replayed = {"t": entry["t"], "p": _remap_ids(entry["p"], id_map)}
+        if "id" in entry:
+            replayed["id"] = entry["id"]
+            pending_ids.add(entry["id"])
+        pending.append(replayed)
+
+    flush_pending()
+
+    return {
+        "components": len(new_state.components),
+        "connections": len(new_state.connections),
+        "values": len(new_state.values),
+        "batches": batches,
+        "errors": errors,
+        "skipped": [
+            {"type": entry["t"], "parameters": entry["p"]} for entry in state.orphans()
+        ],
+        "idMap": id_map,
+        "state": new_state,
+    }
@@ -0,0 +1,27 @@
+"""
+Knowledge assets shipped with the package.
+
+The component mapping, guide and library are small JSON files that used to be
+re-read and re-parsed on every tool call that needed them. They are now parsed
+once per process, on first use. The returned data is shared between callers
+and must be treated as read-only.
+"""
+
+import functools
+import json
+import os
+from typing import Any
+
+ASSET_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def asset_path(name: str) -> str:
+    """Return the path of a knowledge asset"""
+    return os.path.join(ASSET_DIR, name)
+
+
+@functools.cache
+def load_asset(name: str) -> Any:
+    """Parse a JSON knowledge asset once and return the shared result"""
+    with open(asset_path(name), encoding="utf-8") as f:
+        return json.load(f)
@@ -0,0 +1,18 @@
+"""
+Lazy access to optional dependencies.
+
+Optional modules are imported on first use rather than at startup, so
+sessions that never need them do not pay for importing them.
+"""
+
+import functools
+
+
+@functools.cache
+def numpy():
+    """Return the numpy module, or None if it is not installed"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
@@ -0,0 +1,213 @@
+"""
+Command scheduler for a Grasshopper instance.
+
+Read commands run concurrently up to a per-instance limit. Mutating commands
+run alone and in submission order: a write waits for every command submitted
+before it, and every command submitted after it waits for the write, so reads
+always see the effects of earlier writes. Among reads that are ready to run,
+sessions are served round-robin so one busy MCP session cannot starve others.
+"""
+
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+# Commands that only inspect the document and may run concurrently.
+# Anything not listed here (including unknown commands) is treated as mutating.
+READ_COMMANDS = {
+    "get_document_info",
+    "get_component_info",
+    "get_all_components",
+    "get_connections",
+    "search_components",
+    "get_component_parameters",
+    "get_available_patterns",
+    "validate_connection",
+}
+
+DEFAULT_SESSION = "default"
+
+
+def is_read_command(command_type: str) -> bool:
+    """Return True if the command type does not modify the document"""
+    return command_type in READ_COMMANDS
+
+
+class _Ticket:
+    __slots__ = ("seq", "session", "is_read", "granted", "submitted")
+
+    def __init__(self, seq: int, session: str, is_read: bool):
+        self.seq = seq
+        self.session = session
+        self.is_read = is_read
+        self.granted = False
+        self.submitted = time.monotonic()
+
+
+class CommandScheduler:
+    """Readers-writer scheduler with submission ordering and fair queuing"""
+
+    def __init__(self, max_concurrent_reads: int = 4):
+        if max_concurrent_reads < 1:
+            raise ValueError("max_concurrent_reads must be at least 1")
+
+        self.max_concurrent_reads = max_concurrent_reads
+
+        self._condition = threading.Condition()
+        self._seq = 0
+        # Pending tickets per session, each in submission order
+        self._queues: dict[str, deque[_Ticket]] = {}
+        # Round-robin order of sessions with pending tickets
+        self._rotation: deque[str] = deque()
+        self._pending_writes: deque[_Ticket] = deque()
+        self._running_reads = 0
+        self._running_write = False
+
+        # Metrics
+        self._completed_reads = 0
+        self._completed_writes = 0
+        self._max_queue_depth = 0
+        self._total_wait = 0.0
+
+    @contextmanager
+    def slot(self, command_type: str, session: str = DEFAULT_SESSION) -> Iterator[None]:
+        """Block until the command may run, and hold its slot while it runs"""
+        ticket = self._acquire(command_type, session)
+        try:
+            yield
+        finally:
+            self._release(ticket)
+
+    def metrics(self) -> dict[str, Any]:
+        """Return queue depth and throughput counters"""
+        with self._condition:
+            completed = self._completed_reads + self._completed_writes
+            return {
+                "queueDepth": self._queue_depth(),
+                "pendingWrites": len(self._pending_writes),
+                "sessionQueueDepths": {
+                    session: len(tickets) for session, tickets in self._queues.items()
+                },
+                "runningReads": self._running_reads,
+                "runningWrite": self._running_write,
+                "maxConcurrentReads": self.max_concurrent_reads,
+                "maxQueueDepth": self._max_queue_depth,
+                "completedReads": self._completed_reads,
+                "completedWrites": self._completed_writes,
+                "averageWaitMs": (
+                    round(self._total_wait / completed * 1000, 3) if completed else 0.0
+                ),
+            }
+
+    def _acquire(self, command_type: str, session: str) -> _Ticket:
+        with self._condition:
+            self._seq += 1
+            ticket = _Ticket(self._seq, session, is_read_command(command_type))
+
+            if session not in self._queues:
+                self._queues[session] = deque()
+                self._rotation.append(session)
+            self._queues[session].append(ticket)
+            if not ticket.is_read:
+                self._pending_writes.append(ticket)
+            self._max_queue_depth = max(self._max_queue_depth, self._queue_depth())
+
+            self._dispatch()
+            while not ticket.granted:
+                self._condition.wait()
+
+            self._total_wait += time.monotonic() - ticket.submitted
+            return ticket
+
+    def _release(self, ticket: _Ticket):
+        with self._condition:
+            if ticket.is_read:
+                self._running_reads -= 1
+                self._completed_reads += 1
+            else:
+                self._running_write = False
+                self._completed_writes += 1
+            self._dispatch()
+
+    def _queue_depth(self) -> int:
+        return sum(len(tickets) for tickets in self._queues.values())
+
+    def _dispatch(self):
+        # Caller holds self._condition
+        granted = False
+
+        if self._running_write:
+            return
+
+        # A write runs once everything submitted before it has finished
+        if self._pending_writes and self._running_reads == 0:
+            write = self._pending_writes[0]
+            if self._oldest_pending_seq() == write.seq:
+                self._pending_writes.popleft()
+                self._grant(write)
+                self._running_write = True
+                self._condition.notify_all()
+                return
+
+        # Reads submitted before the next write run concurrently, one session
+        # at a time in round-robin order
+        barrier = self._pending_writes[0].seq if self._pending_writes else None
+        while self._running_reads < self.max_concurrent_reads:
+            ticket = self._next_read(barrier)
+            if ticket is None:
+                break
+            self._grant(ticket)
+            self._running_reads += 1
+            granted = True
+
+        if granted:
+            self._condition.notify_all()
+
+    def _next_read(self, barrier: int | None) -> _Ticket | None:
+        for _ in range(len(self._rotation)):
+            session = self._rotation[0]
+            self._rotation.rotate(-1)
+            head = self._queues[session][0]
+            if head.is_read and (barrier is None or head.seq < barrier):
+                return head
+        return None
+
+    def _oldest_pending_seq(self) -> int | None:
+        heads = [tickets[0].seq for tickets in self._queues.values()]
+        return min(heads) if heads else None
+
+    def _grant(self, ticket: _Ticket):
+        queue = self._queues[ticket.session]
+        queue.popleft()
+        if not queue:
+            del self._queues[ticket.session]
+            self._rotation.remove(ticket.session)
+        ticket.granted = True
+
+
+_schedulers: dict[tuple[str, int], CommandScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(
+    host: str, port: int, max_concurrent_reads: int = 4
+) -> CommandScheduler:
+    """Return the scheduler for a Grasshopper instance, creating it on first use"""
+    key = (host, port)
+    with _schedulers_lock:
+        if key not in _schedulers:
+            _schedulers[key] = CommandScheduler(max_concurrent_reads)
+        return _schedulers[key]
+
+
+def all_metrics() -> dict[str, Any]:
+    """Return scheduler metrics for every Grasshopper instance"""
+    with _schedulers_lock:
+        schedulers = dict(_schedulers)
+    return {
+        f"{host}:{port}": scheduler.metrics()
+        for (host, port), scheduler in schedulers.items()
+    }
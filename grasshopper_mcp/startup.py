@@ -0,0 +1,139 @@
+"""
+Cold-start profiling for the bridge (``grasshopper-mcp --profile-startup``).
+
+Import cost is measured in a fresh interpreter with ``python -X importtime``,
+because by the time this runs the current process has already imported the
+bridge. Initialization phases that happen lazily on first use (knowledge
+assets, compatibility matrix, MCP server creation, tool listing, optional
+NumPy) are then timed in-process with their caches cleared.
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from importlib.util import find_spec
+from types import ModuleType
+from typing import Any
+
+from .knowledge import ASSET_DIR
+
+BRIDGE_MODULE = "grasshopper_mcp.bridge"
+
+
+def _run_python(code: str, *options: str) -> tuple[float, str]:
+    """Run code in a fresh interpreter and return wall time (ms) and stderr"""
+    env = dict(os.environ)
+    package_root = os.path.dirname(ASSET_DIR)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [package_root, env.get("PYTHONPATH")])
+    )
+
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, *options, "-c", code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return (time.perf_counter() - start) * 1000, completed.stderr
+
+
+def parse_importtime(output: str, module: str) -> tuple[float, float, dict[str, float]]:
+    """
+    Parse ``-X importtime`` output for one module
+
+    Returns:
+        Cumulative import time of the module (ms), its own execution time
+        (ms), and the cumulative time (ms) of each module it imports directly
+    """
+    entries = []
+    for line in output.splitlines():
+        # "import time: <self us> | <cumulative us> | <indented module name>"
+        if not line.startswith("import time:") or line.count("|") != 2:
+            continue
+        self_us, cumulative_us, name = line.split("|")
+        try:
+            entries.append((name, int(self_us.split(":")[-1]), int(cumulative_us)))
+        except ValueError:
+            continue  # Header line
+
+    # Entries are printed children first, so the module's direct imports are
+    # the entries just before it that are one indentation level deeper
+    total = own = 0.0
+    children: dict[str, float] = {}
+    for index, (name, self_us, cumulative_us) in enumerate(entries):
+        if name.strip() != module:
+            continue
+        depth = len(name) - len(name.lstrip())
+        total, own = cumulative_us / 1000, self_us / 1000
+        for child, _, child_us in reversed(entries[:index]):
+            child_depth = len(child) - len(child.lstrip())
+            if child_depth <= depth:
+                break
+            if child_depth == depth + 2:
+                children[child.strip()] = child_us / 1000
+        break
+
+    return total, own, dict(sorted(children.items(), key=lambda item: -item[1]))
+
+
+def _time(fn: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    fn()
+    return round((time.perf_counter() - start) * 1000, 3)
+
+
+def profile_startup(bridge: ModuleType) -> dict[str, Any]:
+    """
+    Return an import and initialization timing breakdown, in milliseconds
+
+    Args:
+        bridge: The running bridge module, which is ``__main__`` when started
+            with ``python -m grasshopper_mcp.bridge``
+    """
+    from . import optional
+    from .knowledge import load_asset
+
+    interpreter_ms, _ = _run_python("pass")
+    cold_start_ms, importtime = _run_python(
+        f"import {BRIDGE_MODULE}", "-X", "importtime"
+    )
+    import_ms, module_init_ms, imports = parse_importtime(importtime, BRIDGE_MODULE)
+
+    def load_assets():
+        load_asset.cache_clear()
+        bridge.load_component_mapping()
+        bridge.get_component_guide()
+        bridge.get_component_library()
+
+    def build_matrix():
+        bridge.get_compatibility_matrix.cache_clear()
+        bridge.get_compatibility_matrix()
+
+    def import_numpy():
+        optional.numpy.cache_clear()
+        optional.numpy()
+
+    # NumPy first, so its import is not attributed to the matrix build
+    init = {
+        "numpy": _time(import_numpy) if find_spec("numpy") is not None else None,
+        "knowledgeAssets": _time(load_assets),
+        "compatibilityMatrix": _time(build_matrix),
+        # Imports the MCP SDK, which the bridge module itself does not
+        "server": _time(bridge.create_server),
+        "listTools": _time(lambda: asyncio.run(bridge.server.list_tools())),
+    }
+
+    return {
+        "python": sys.version.split()[0],
+        "interpreterMs": round(interpreter_ms, 3),
+        "coldStartMs": round(cold_start_ms, 3),
+        "importMs": round(import_ms, 3),
+        "moduleInitMs": round(module_init_ms, 3),
+        "imports": {name: round(ms, 3) for name, ms in imports.items()},
+        "init": init,
+    }
@@ -0,0 +1,170 @@
+"""
+Tests for local connection validation against the data-type compatibility
+matrix, with NumPy and with the list fallback.
+"""
+
+import unittest
+from unittest import mock
+
+from grasshopper_mcp import compatibility
+from grasshopper_mcp.compatibility import (
+    COMPATIBLE,
+    INCOMPATIBLE,
+    UNDECIDED,
+    CompatibilityMatrix,
+    normalize_name,
+    validate_edges,
+)
+from grasshopper_mcp.optional import numpy
+
+LIBRARY = {
+    "dataTypes": [
+        {"name": "Circle", "compatibleWith": ["Curve"]},
+        {"name": "Number", "compatibleWith": ["Integer"], "incompatibleWith": ["Brep"]},
+        {"name": "Curve"},
+        {"name": "Brep"},
+        {"name": "Any"},
+    ],
+    "categories": [
+        {
+            "name": "Test",
+            "components": [
+                {
+                    "name": "Circle",
+                    "fullName": "Circle CNR",
+                    "inputs": [{"name": "Radius", "type": "Number"}],
+                    "outputs": [{"name": "Circle", "type": "Circle"}],
+                },
+                {
+                    "name": "Number Slider",
+                    "inputs": [],
+                    "outputs": [{"name": "Number", "type": "Number"}],
+                },
+                {
+                    "name": "Extrude",
+                    "inputs": [
+                        {"name": "Base", "type": "Curve"},
+                        {"name": "Direction", "type": "Vector"},
+                    ],
+                    "outputs": [{"name": "Extrusion", "type": "Brep"}],
+                },
+                {
+                    "name": "Cap Holes",
+                    "inputs": [{"name": "Brep", "type": "Brep"}],
+                    "outputs": [{"name": "Brep", "type": "Brep"}],
+                },
+                {
+                    "name": "Panel",
+                    "inputs": [{"name": "Input", "type": "Any"}],
+                    "outputs": [{"name": "Output", "type": "Text"}],
+                },
+            ],
+        }
+    ],
+}
+
+TYPES = {
+    "circle": "Circle",
+    "slider": "GH_NumberSlider",
+    "extrude": "Extrude",
+    "cap": "Cap Holes",
+    "panel": "Panel",
+    "mystery": "Some Plugin Component",
+}
+
+
+class ValidateEdgesTest(unittest.TestCase):
+    use_numpy = True
+
+    def setUp(self):
+        if self.use_numpy and numpy() is None:
+            self.skipTest("NumPy is not installed")
+        if not self.use_numpy:
+            patcher = mock.patch.object(compatibility, "numpy", lambda: None)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.matrix = CompatibilityMatrix(LIBRARY)
+
+    def validate(self, *edges):
+        return validate_edges(self.matrix, edges, TYPES)
+
+    def cell(self, source, target):
+        return self.matrix.check(
+            [self.matrix.type_index(source)], [self.matrix.type_index(target)]
+        )[0]
+
+    def test_declarations_are_directional(self):
+        self.assertEqual(self.cell("Circle", "Curve"), COMPATIBLE)
+        self.assertEqual(self.cell("Curve", "Circle"), UNDECIDED)
+        self.assertEqual(self.cell("Number", "Brep"), INCOMPATIBLE)
+        self.assertEqual(self.cell("Brep", "Number"), UNDECIDED)
+        self.assertEqual(self.cell("Brep", "Any"), COMPATIBLE)
+
+    def test_compatible_edge(self):
+        (verdict,) = self.validate(
+            {"sourceId": "circle", "targetId": "extrude", "targetParam": "base"}
+        )
+        self.assertIs(verdict["valid"], True)
+        self.assertEqual(verdict["targetParam"], "Base")
+        self.assertEqual(verdict["checkedBy"], "matrix")
+
+    def test_any_input_is_tried_without_target_param(self):
+        (verdict,) = self.validate({"sourceId": "slider", "targetId": "circle"})
+        self.assertIs(verdict["valid"], True)
+        self.assertEqual(verdict["targetParam"], "Radius")
+
+    def test_declared_incompatible_edge(self):
+        (verdict,) = self.validate({"sourceId": "slider", "targetId": "cap"})
+        self.assertIs(verdict["valid"], False)
+        self.assertEqual(verdict["reason"], "Number is declared incompatible with Brep")
+
+    def test_reverse_of_declaration_is_undecided(self):
+        (verdict,) = self.validate({"sourceId": "cap", "targetId": "circle"})
+        self.assertIsNone(verdict["valid"])
+        self.assertEqual(verdict["reason"], "No compatibility rule in knowledge base")
+
+    def test_undecided_input_keeps_edge_open(self):
+        # Number -> Base (Curve) is undecided, Number -> Direction has an
+        # unknown type, so Grasshopper has to check the edge
+        (verdict,) = self.validate({"sourceId": "slider", "targetId": "extrude"})
+        self.assertIsNone(verdict["valid"])
+
+    def test_unknown_components_and_params(self):
+        verdicts = self.validate(
+            {"sourceId": "mystery", "targetId": "panel"},
+            {"sourceId": "circle", "targetId": "untracked"},
+            {"sourceId": "circle", "targetId": "panel", "targetParam": "Nope"},
+            {"sourceId": "circle", "sourceParamIndex": "3", "targetId": "panel"},
+        )
+        self.assertEqual([v["valid"] for v in verdicts], [None] * 4)
+        self.assertEqual(
+            [v["reason"] for v in verdicts],
+            [
+                "Component type not in knowledge base",
+                "Component type not in knowledge base",
+                "Input not found in knowledge base for Panel",
+                "Output not found in knowledge base for Circle",
+            ],
+        )
+
+    def test_param_indices(self):
+        verdicts = self.validate(
+            {"sourceId": "circle", "targetId": "extrude", "targetParamIndex": "0"},
+            {"sourceId": "circle", "targetId": "extrude", "targetParamIndex": 1},
+        )
+        self.assertIs(verdicts[0]["valid"], True)
+        self.assertEqual(verdicts[0]["targetParam"], "Base")
+        # Circle -> Vector has no declaration either way
+        self.assertIsNone(verdicts[1]["valid"])
+
+    def test_normalize_name(self):
+        self.assertEqual(normalize_name("GH_NumberSlider"), "number slider")
+        self.assertEqual(normalize_name("Component_Circle"), "circle")
+
+
+class FallbackValidateEdgesTest(ValidateEdgesTest):
+    use_numpy = False
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,199 @@
+"""
+Tests for the change-event consumer against a local event-emitting mock of the
+GH_MCP listener.
+"""
+
+import json
+import queue
+import socketserver
+import threading
+import unittest
+
+from grasshopper_mcp.events import (
+    CONNECTED_EVENT,
+    DISCONNECTED_EVENT,
+    CanvasTracker,
+    ChangeSubscriber,
+)
+
+TIMEOUT = 5.0
+
+
+class MockListener(socketserver.ThreadingTCPServer):
+    """Accepts ``subscribe`` connections and pushes queued events to them"""
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, accept: bool = True):
+        super().__init__(("localhost", 0), MockListenerHandler)
+        self.accept = accept
+        self.commands: queue.Queue = queue.Queue()
+        self.events: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def push(self, event: dict):
+        self.events.put(event)
+
+    def drop_connection(self):
+        self.events.put(None)
+
+    def close(self):
+        self.shutdown()
+        self.server_close()
+
+
+class MockListenerHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        command = json.loads(self.rfile.readline())
+        self.server.commands.put(command)
+
+        if not self.server.accept:
+            self._send({"success": False, "error": "subscriptions disabled"})
+            return
+        self._send({"success": True, "data": {"subscribed": True}})
+
+        while True:
+            event = self.server.events.get()
+            if event is None:
+                return
+            self._send(event)
+
+    def _send(self, message: dict):
+        self.wfile.write((json.dumps(message) + "\n").encode("utf-8"))
+        self.wfile.flush()
+
+
+class ChangeSubscriberTest(unittest.TestCase):
+    def setUp(self):
+        self.received: queue.Queue = queue.Queue()
+        self.tracker = CanvasTracker()
+
+    def start(self, listener: MockListener) -> ChangeSubscriber:
+        def on_event(event):
+            self.tracker.apply(event)
+            self.received.put(event)
+
+        subscriber = ChangeSubscriber(
+            "localhost",
+            listener.port,
+            on_event=on_event,
+            reconnect_delay=0.05,
+            max_reconnect_delay=0.1,
+        )
+        subscriber.start()
+        self.addCleanup(listener.close)
+        self.addCleanup(subscriber.stop, TIMEOUT)
+        return subscriber
+
+    def next_event(self) -> dict:
+        return self.received.get(timeout=TIMEOUT)
+
+    def test_handshake(self):
+        listener = MockListener()
+        subscriber = self.start(listener)
+
+        command = listener.commands.get(timeout=TIMEOUT)
+        self.assertEqual(command["type"], "subscribe")
+        self.assertEqual(self.next_event(), {"event": CONNECTED_EVENT})
+        self.assertTrue(subscriber.connected)
+        self.assertFalse(self.tracker.stale)
+
+    def test_rejected_subscription_is_retried(self):
+        listener = MockListener(accept=False)
+        subscriber = self.start(listener)
+
+        listener.commands.get(timeout=TIMEOUT)
+        listener.commands.get(timeout=TIMEOUT)
+        self.assertFalse(subscriber.connected)
+        self.assertTrue(self.received.empty())
+        self.assertTrue(self.tracker.stale)
+
+    def test_events_are_folded_into_tracker(self):
+        listener = MockListener()
+        self.start(listener)
+        self.next_event()
+
+        events = [
+            {
+                "event": "objects_added",
+                "seq": 1,
+                "objects": [
+                    {"id": "a", "type": "GH_NumberSlider", "name": "Slider"},
+                    {"id": "b", "type": "Component_Circle", "name": "Circle"},
+                ],
+            },
+            {
+                "event": "wire_changed",
+                "seq": 2,
+                "componentId": "b",
+                "paramId": "b-radius",
+                "paramName": "Radius",
+                "sourceIds": ["a"],
+            },
+            {"event": "solution_completed", "seq": 3, "objectCount": 2},
+            {"event": "objects_removed", "seq": 4, "ids": ["a"]},
+        ]
+        for event in events:
+            listener.push(event)
+        for event in events:
+            self.assertEqual(self.next_event(), event)
+
+        self.assertEqual(set(self.tracker.components), {"b"})
+        self.assertEqual(self.tracker.wires, {"b-radius": ["a"]})
+        self.assertEqual(
+            self.tracker.summary(),
+            {
+                # connected + four events
+                "version": 5,
+                "live": True,
+                "componentsAdded": 1,
+                "solutions": 1,
+            },
+        )
+
+    def test_unknown_events_do_not_change_version(self):
+        tracker = CanvasTracker()
+        self.assertFalse(tracker.apply({"event": "something_new"}))
+        self.assertEqual(tracker.version, 0)
+
+    def test_disconnect_marks_stale_and_reconnects(self):
+        listener = MockListener()
+        subscriber = self.start(listener)
+        self.next_event()
+
+        listener.push({"event": "objects_added", "seq": 1, "objects": [{"id": "a"}]})
+        self.next_event()
+        self.assertIn("a", self.tracker.components)
+
+        listener.drop_connection()
+        self.assertEqual(self.next_event(), {"event": DISCONNECTED_EVENT})
+        self.assertTrue(self.tracker.stale)
+        # Events may have been missed, so the view is dropped
+        self.assertEqual(self.tracker.components, {})
+
+        self.assertEqual(self.next_event(), {"event": CONNECTED_EVENT})
+        self.assertTrue(subscriber.connected)
+        self.assertFalse(self.tracker.stale)
+
+    def test_overflow_forces_resync(self):
+        listener = MockListener()
+        self.start(listener)
+        self.next_event()
+
+        listener.push({"event": "objects_added", "objects": [{"id": "a"}]})
+        listener.push({"event": "overflow"})
+        self.next_event()
+        self.assertEqual(self.next_event(), {"event": "overflow"})
+
+        self.assertTrue(self.tracker.stale)
+        self.assertEqual(self.tracker.components, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+"""
+Tests for bulk geometry packing and chunking. Packing is checked with NumPy
+and with the standard-library fallback, which must accept and reject the
+same input with the same errors.
+"""
+
+import base64
+import struct
+import unittest
+from unittest import mock
+
+from grasshopper_mcp import geometry
+from grasshopper_mcp.geometry import (
+    POINT_BYTES,
+    chunk_polylines,
+    chunk_ranges,
+    collect_chunks,
+    encode,
+    pack_counts,
+    pack_points,
+    pack_values,
+)
+from grasshopper_mcp.optional import numpy
+
+
+class PackingTest(unittest.TestCase):
+    use_numpy = True
+
+    def setUp(self):
+        if self.use_numpy and numpy() is None:
+            self.skipTest("NumPy is not installed")
+        if not self.use_numpy:
+            patcher = mock.patch.object(geometry, "numpy", lambda: None)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def assertInvalid(self, message, function, *args):
+        with self.assertRaises(ValueError) as context:
+            function(*args)
+        self.assertEqual(str(context.exception), message)
+
+    def test_pack_points(self):
+        flat, count = pack_points([[1, 2], [3, 4]])
+        self.assertEqual(count, 2)
+        self.assertEqual(list(flat), [1.0, 2.0, 0.0, 3.0, 4.0, 0.0])
+
+        flat, count = pack_points([(1, 2, 3)])
+        self.assertEqual((count, list(flat)), (1, [1.0, 2.0, 3.0]))
+
+        flat, count = pack_points([0, 1, 2, 3, 4, 5])
+        self.assertEqual(count, 2)
+        self.assertEqual(list(flat), [0.0, 1.0, 2.0, 3.0, 4.0, 5.0])
+
+    def test_pack_points_rejects_invalid_input(self):
+        self.assertInvalid("coordinates must not be empty", pack_points, [])
+        self.assertInvalid(
+            "coordinates must be a multiple of 3 values", pack_points, [1, 2]
+        )
+        self.assertInvalid(
+            "centers must have the same number of values per point",
+            pack_points,
+            [[1, 2], [1, 2, 3]],
+            "centers",
+        )
+        self.assertInvalid(
+            "coordinates must have 2 or 3 values per point",
+            pack_points,
+            [[1, 2, 3, 4]],
+        )
+        self.assertInvalid("coordinates must be numeric", pack_points, ["1", "2", "3"])
+        self.assertInvalid(
+            "coordinates must be finite numbers",
+            pack_points,
+            [0, 0, float("nan")],
+        )
+
+    def test_pack_values(self):
+        self.assertEqual(list(pack_values(2, 3, "radii")), [2.0])
+        self.assertEqual(list(pack_values([1, 2.5], 2, "radii")), [1.0, 2.5])
+
+    def test_pack_values_rejects_invalid_input(self):
+        self.assertInvalid(
+            "radii must contain one value or one value per item",
+            pack_values,
+            [1, 2],
+            3,
+            "radii",
+        )
+        self.assertInvalid(
+            "radii must be positive finite numbers", pack_values, [1, 0], 2, "radii"
+        )
+        self.assertInvalid(
+            "radii must be positive finite numbers",
+            pack_values,
+            float("inf"),
+            1,
+            "radii",
+        )
+        self.assertInvalid("radii must be numeric", pack_values, ["1"], 1, "radii")
+        self.assertInvalid("radii must be numeric", pack_values, [None], 1, "radii")
+
+    def test_pack_counts(self):
+        self.assertEqual(pack_counts([2, 3], 5), [2, 3])
+        if self.use_numpy:
+            np = numpy()
+            self.assertEqual(pack_counts(np.array([2, 3]), 5), [2, 3])
+            self.assertInvalid(
+                "counts must be integers", pack_counts, np.array([2.0, 3.0]), 5
+            )
+
+    def test_pack_counts_rejects_invalid_input(self):
+        for counts in ([2.5, 2.5], [2, "3"], [True, 4], [[2, 3]], 5):
+            with self.subTest(counts=counts):
+                self.assertInvalid("counts must be integers", pack_counts, counts, 5)
+        self.assertInvalid("counts must not be empty", pack_counts, [], 0)
+        self.assertInvalid(
+            "Every polyline needs at least 2 vertices", pack_counts, [1, 4], 5
+        )
+        self.assertInvalid(
+            "counts add up to 4 vertices but 5 were given", pack_counts, [2, 2], 5
+        )
+
+    def test_encode_little_endian_float64(self):
+        flat, _ = pack_points([[1.5, -2, 3]])
+        self.assertEqual(
+            struct.unpack("<3d", base64.b64decode(encode(flat))), (1.5, -2.0, 3.0)
+        )
+
+
+class FallbackPackingTest(PackingTest):
+    use_numpy = False
+
+
+class ChunkingTest(unittest.TestCase):
+    def test_chunk_ranges(self):
+        self.assertEqual(
+            chunk_ranges(5, POINT_BYTES, 2 * POINT_BYTES), [(0, 2), (2, 4), (4, 5)]
+        )
+        self.assertEqual(chunk_ranges(0, POINT_BYTES), [])
+        # Items larger than a chunk are still sent one at a time
+        self.assertEqual(chunk_ranges(2, 100, 10), [(0, 1), (1, 2)])
+
+    def test_chunk_polylines(self):
+        self.assertEqual(
+            chunk_polylines([2, 3, 2, 4], 5 * POINT_BYTES),
+            [(0, 2, 0, 5), (2, 3, 5, 7), (3, 4, 7, 11)],
+        )
+        self.assertEqual(chunk_polylines([]), [])
+
+    def test_collect_chunks(self):
+        ranges = [(0, 2), (2, 4), (4, 5)]
+        responses = [
+            {"success": True, "data": {"id": "p1", "count": 2}},
+            {"success": False, "error": "boom"},
+            {"success": True, "result": {"id": "p3", "count": 1}},
+        ]
+
+        self.assertEqual(
+            collect_chunks(ranges, responses),
+            {
+                "success": False,
+                "data": {
+                    "count": 3,
+                    "chunks": [
+                        {"start": 0, "count": 2, "id": "p1"},
+                        {"start": 4, "count": 1, "id": "p3"},
+                    ],
+                    "errors": ["Items 2-3: boom"],
+                },
+            },
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,298 @@
+"""
+Tests for the mutation journal: state folding, on-disk snapshots shared by
+several bridge processes, crash recovery and replay with GUID remapping.
+"""
+
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from grasshopper_mcp import journal as journal_module
+from grasshopper_mcp.journal import (
+    JOURNAL_FILE,
+    SNAPSHOT_FILE,
+    Journal,
+    JournalState,
+    replay_state,
+    response_data,
+    unwrap_response,
+)
+
+
+def ok(data=None):
+    return {"success": True, "data": data, "error": None}
+
+
+def error(message):
+    return {"success": False, "data": None, "error": message}
+
+
+def add(journal, component_id, component_type="Number Slider"):
+    journal.record(
+        "add_component",
+        {"type": component_type, "x": 0, "y": 0},
+        ok({"id": component_id}),
+    )
+
+
+class FakeGrasshopper:
+    """execute_batch endpoint that assigns new GUIDs to added components"""
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.batches = []
+        self.next_id = 0
+
+    def send(self, command_type, params):
+        assert command_type == "execute_batch"
+        self.batches.append(params["commands"])
+        return ok([self._execute(command) for command in params["commands"]])
+
+    def _execute(self, command):
+        if command["type"] in self.fail:
+            return error("boom")
+        if command["type"] == "add_component":
+            self.next_id += 1
+            return ok({"id": f"new-{self.next_id}"})
+        return ok({})
+
+
+class ResponseTest(unittest.TestCase):
+    def test_double_wrapped_response_is_unwrapped(self):
+        response = ok(error("Source parameter not found"))
+        self.assertEqual(unwrap_response(response), error("Source parameter not found"))
+        self.assertEqual(response_data(ok(ok({"id": "a"}))), {"id": "a"})
+
+    def test_result_with_success_field_is_not_unwrapped(self):
+        # connect_components results carry their own "success" and "message"
+        response = ok({"success": True, "message": "Connection created"})
+        self.assertEqual(unwrap_response(response), response)
+
+    def test_legacy_result_field(self):
+        self.assertEqual(response_data({"success": True, "result": [1]}), [1])
+
+
+class JournalStateTest(unittest.TestCase):
+    def test_fold(self):
+        state = JournalState()
+        state.apply({"t": "add_component", "p": {"type": "Circle"}, "id": "a"})
+        state.apply({"t": "add_component", "p": {"type": "Panel"}, "id": "b"})
+        connection = {"sourceId": "a", "targetId": "b"}
+        state.apply({"t": "connect_components", "p": connection})
+        state.apply({"t": "connect_components", "p": connection})
+        state.apply({"t": "set_component_value", "p": {"id": "b", "value": "1"}})
+        state.apply({"t": "set_component_value", "p": {"id": "b", "value": "2"}})
+
+        self.assertEqual(set(state.components), {"a", "b"})
+        self.assertEqual(state.connections, [connection])
+        self.assertEqual(state.values, {"b": "2"})
+
+        state.apply({"t": "clear_document", "p": {}})
+        self.assertEqual(state.to_dict()["components"], {})
+        self.assertEqual(state.connections, [])
+        self.assertEqual(state.values, {})
+
+    def test_orphans_are_not_replayed(self):
+        state = JournalState()
+        state.apply({"t": "add_component", "p": {"type": "Circle"}, "id": "a"})
+        state.apply({"t": "set_component_value", "p": {"id": "loaded", "value": "3"}})
+        state.apply(
+            {"t": "connect_components", "p": {"sourceId": "loaded", "targetId": "a"}}
+        )
+
+        self.assertEqual(
+            [entry["t"] for entry in state.to_entries()], ["add_component"]
+        )
+        self.assertEqual(
+            [entry["t"] for entry in state.orphans()],
+            ["set_component_value", "connect_components"],
+        )
+
+    def test_unsupported_snapshot_version_is_ignored(self):
+        data = JournalState().to_dict()
+        data.update(version=-1, components={"a": {}})
+        self.assertEqual(JournalState.from_dict(data).components, {})
+
+
+class JournalTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def journal(self, **kwargs) -> Journal:
+        kwargs.setdefault("fsync", "never")
+        journal = Journal(self.directory, **kwargs)
+        self.addCleanup(journal.flush)
+        return journal
+
+    def test_records_only_successful_mutations(self):
+        journal = self.journal()
+        add(journal, "a")
+        journal.record("add_component", {"type": "Panel"}, error("boom"))
+        journal.record("get_document_info", {}, ok({}))
+        # Refused wire from a listener that wraps the handler's error response
+        journal.record(
+            "connect_components",
+            {"sourceId": "a", "targetId": "b"},
+            ok(error("Parameters are not compatible")),
+        )
+        journal.record(
+            "connect_components",
+            {"sourceId": "a", "targetId": "a"},
+            ok(ok({"success": True, "message": "Connection created"})),
+        )
+
+        state = journal.load_state()
+        self.assertEqual(list(state.components), ["a"])
+        self.assertEqual(state.connections, [{"sourceId": "a", "targetId": "a"}])
+        self.assertEqual(journal.component_types(), {"a": "Number Slider"})
+
+    def test_snapshot_truncates_journal(self):
+        journal = self.journal(snapshot_interval=3)
+        for component_id in "abc":
+            add(journal, component_id)
+        journal.flush()
+
+        self.assertTrue(os.path.exists(os.path.join(self.directory, SNAPSHOT_FILE)))
+        self.assertEqual(os.path.getsize(os.path.join(self.directory, JOURNAL_FILE)), 0)
+
+        add(journal, "d")
+        journal.flush()
+        state = self.journal().load_state()
+        self.assertEqual(list(state.components), ["a", "b", "c", "d"])
+
+    def test_processes_sharing_a_directory_keep_each_others_entries(self):
+        first = self.journal(snapshot_interval=2)
+        second = self.journal(snapshot_interval=2)
+
+        add(first, "a")
+        first.flush()
+        add(second, "c")
+        second.flush()
+        # Snapshot written by the first journal from what is on disk
+        add(first, "b")
+        first.flush()
+
+        for journal in (first, second, self.journal()):
+            self.assertEqual(set(journal.load_state().components), {"a", "b", "c"})
+
+    def test_partial_final_line_does_not_corrupt_next_entry(self):
+        journal_path = os.path.join(self.directory, JOURNAL_FILE)
+        journal = self.journal()
+        add(journal, "a")
+        journal.flush()
+        # Simulate a crash in the middle of writing an entry
+        with open(journal_path, "a", encoding="utf-8") as f:
+            f.write('{"t":"add_component","p":{"ty')
+
+        journal = self.journal()
+        add(journal, "b")
+        journal.flush()
+
+        self.assertEqual(set(journal.load_state().components), {"a", "b"})
+
+    def test_interval_policy_syncs_idle_tail(self):
+        journal = self.journal(fsync="interval", flush_interval=0.05)
+        with mock.patch.object(journal_module.os, "fsync") as fsync:
+            add(journal, "a")
+            journal.flush()
+            self.assertEqual(fsync.call_count, 1)
+
+            # Within the interval: written but not yet synced
+            add(journal, "b")
+            journal.flush()
+            self.assertEqual(fsync.call_count, 1)
+
+            deadline = time.monotonic() + 5
+            while fsync.call_count < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(fsync.call_count, 2)
+
+    def test_reset_replaces_state(self):
+        journal = self.journal()
+        add(journal, "a")
+        state = JournalState()
+        state.apply({"t": "add_component", "p": {"type": "Panel"}, "id": "z"})
+        journal.reset(state)
+
+        self.assertEqual(list(self.journal().load_state().components), ["z"])
+        self.assertEqual(journal.component_types(), {"z": "Panel"})
+
+    def test_invalid_fsync_policy(self):
+        with self.assertRaises(ValueError):
+            Journal(self.directory, fsync="sometimes")
+
+
+class ReplayTest(unittest.TestCase):
+    def state(self) -> JournalState:
+        state = JournalState()
+        state.apply({"t": "add_component", "p": {"type": "Slider"}, "id": "a"})
+        state.apply({"t": "add_component", "p": {"type": "Circle"}, "id": "b"})
+        state.apply({"t": "set_component_value", "p": {"id": "a", "value": "5"}})
+        state.apply(
+            {"t": "connect_components", "p": {"sourceId": "a", "targetId": "b"}}
+        )
+        state.apply(
+            {"t": "connect_components", "p": {"sourceId": "loaded", "targetId": "b"}}
+        )
+        return state
+
+    def test_remaps_ids_and_skips_orphans(self):
+        grasshopper = FakeGrasshopper()
+        result = replay_state(self.state(), grasshopper.send, batch_size=100)
+
+        self.assertEqual(result["errors"], [])
+        self.assertEqual(result["idMap"], {"a": "new-1", "b": "new-2"})
+        self.assertEqual((result["components"], result["connections"]), (2, 1))
+        self.assertEqual(
+            result["skipped"],
+            [
+                {
+                    "type": "connect_components",
+                    "parameters": {"sourceId": "loaded", "targetId": "b"},
+                }
+            ],
+        )
+
+        new_state = result["state"]
+        self.assertEqual(new_state.values, {"new-1": "5"})
+        self.assertEqual(
+            new_state.connections, [{"sourceId": "new-1", "targetId": "new-2"}]
+        )
+        # Commands that use a component added in the same batch wait for its ID
+        self.assertEqual([len(batch) for batch in grasshopper.batches], [2, 2])
+
+    def test_batch_size(self):
+        grasshopper = FakeGrasshopper()
+        replay_state(self.state(), grasshopper.send, batch_size=1)
+        self.assertEqual([len(batch) for batch in grasshopper.batches], [1, 1, 1, 1])
+
+    def test_failed_commands_are_errors(self):
+        grasshopper = FakeGrasshopper(fail={"connect_components"})
+        result = replay_state(self.state(), grasshopper.send)
+
+        self.assertEqual(result["errors"], ["connect_components: boom"])
+        self.assertEqual(result["connections"], 0)
+
+    def test_double_wrapped_failure_is_not_restored(self):
+        def send(command_type, params):
+            results = []
+            for command in params["commands"]:
+                if command["type"] == "add_component":
+                    results.append(ok({"id": command["parameters"]["type"]}))
+                else:
+                    results.append(ok(error("Target parameter not found")))
+            return ok(results)
+
+        result = replay_state(self.state(), send)
+
+        self.assertEqual(result["connections"], 0)
+        self.assertEqual(result["values"], 0)
+        self.assertEqual(len(result["errors"]), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
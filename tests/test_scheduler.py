@@ -0,0 +1,171 @@
+"""
+Tests for the per-instance command scheduler: write ordering, read
+concurrency and round-robin fairness between sessions.
+"""
+
+import threading
+import time
+import unittest
+
+from grasshopper_mcp.scheduler import CommandScheduler, is_read_command
+
+TIMEOUT = 5.0
+
+
+class Command:
+    """Runs one command through the scheduler on its own thread"""
+
+    def __init__(
+        self,
+        scheduler: CommandScheduler,
+        name: str,
+        command_type: str,
+        session: str,
+        log: list,
+        hold: bool = True,
+    ):
+        self.name = name
+        self.started = threading.Event()
+        self.done = threading.Event()
+        self._finish = threading.Event()
+        if not hold:
+            self._finish.set()
+
+        def run():
+            with scheduler.slot(command_type, session):
+                log.append(name)
+                self.started.set()
+                self._finish.wait(TIMEOUT)
+            self.done.set()
+
+        self._thread = threading.Thread(target=run, daemon=True)
+
+    def start(self) -> "Command":
+        self._thread.start()
+        return self
+
+    def finish(self):
+        self._finish.set()
+        assert self.done.wait(TIMEOUT), f"{self.name} did not finish"
+
+
+class CommandSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.log: list[str] = []
+
+    def submit(self, scheduler, name, command_type, session="default", hold=True):
+        """Submit a command and wait until it is running or queued"""
+        before = self.submitted(scheduler)
+        command = Command(scheduler, name, command_type, session, self.log, hold)
+        self.addCleanup(command.finish)
+        command.start()
+
+        deadline = time.monotonic() + TIMEOUT
+        while self.submitted(scheduler) == before:
+            self.assertLess(time.monotonic(), deadline, f"{name} was not submitted")
+            time.sleep(0.001)
+        return command
+
+    @staticmethod
+    def submitted(scheduler) -> int:
+        metrics = scheduler.metrics()
+        return (
+            metrics["queueDepth"]
+            + metrics["runningReads"]
+            + metrics["runningWrite"]
+            + metrics["completedReads"]
+            + metrics["completedWrites"]
+        )
+
+    def test_read_commands(self):
+        self.assertTrue(is_read_command("get_document_info"))
+        self.assertTrue(is_read_command("validate_connection"))
+        self.assertFalse(is_read_command("add_component"))
+        # Unknown commands are assumed to modify the document
+        self.assertFalse(is_read_command("something_new"))
+
+    def test_invalid_read_limit(self):
+        with self.assertRaises(ValueError):
+            CommandScheduler(max_concurrent_reads=0)
+
+    def test_write_waits_for_earlier_reads_and_blocks_later_ones(self):
+        scheduler = CommandScheduler()
+        read = self.submit(scheduler, "read", "get_document_info")
+        self.assertTrue(read.started.wait(TIMEOUT))
+        write = self.submit(scheduler, "write", "add_component")
+        later = self.submit(scheduler, "later", "get_document_info")
+        self.assertFalse(write.started.is_set())
+        self.assertFalse(later.started.is_set())
+
+        read.finish()
+        self.assertTrue(write.started.wait(TIMEOUT))
+        self.assertFalse(later.started.is_set())
+
+        write.finish()
+        self.assertTrue(later.started.wait(TIMEOUT))
+        self.assertEqual(self.log, ["read", "write", "later"])
+
+    def test_writes_run_alone_in_submission_order(self):
+        scheduler = CommandScheduler()
+        first = self.submit(scheduler, "first", "add_component")
+        self.assertTrue(first.started.wait(TIMEOUT))
+        for name in ("second", "third"):
+            self.submit(scheduler, name, "add_component", session=name, hold=False)
+
+        self.assertEqual(scheduler.metrics()["pendingWrites"], 2)
+        first.finish()
+
+        deadline = time.monotonic() + TIMEOUT
+        while scheduler.metrics()["completedWrites"] < 3:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.001)
+        self.assertEqual(self.log, ["first", "second", "third"])
+
+    def test_reads_run_concurrently_up_to_limit(self):
+        scheduler = CommandScheduler(max_concurrent_reads=2)
+        reads = [
+            self.submit(scheduler, f"read{i}", "get_all_components") for i in range(3)
+        ]
+        self.assertTrue(reads[0].started.wait(TIMEOUT))
+        self.assertTrue(reads[1].started.wait(TIMEOUT))
+        self.assertFalse(reads[2].started.is_set())
+        self.assertEqual(scheduler.metrics()["runningReads"], 2)
+
+        reads[0].finish()
+        self.assertTrue(reads[2].started.wait(TIMEOUT))
+
+    def test_sessions_are_served_round_robin(self):
+        scheduler = CommandScheduler(max_concurrent_reads=1)
+        write = self.submit(scheduler, "write", "add_component")
+        self.assertTrue(write.started.wait(TIMEOUT))
+
+        for name in ("a1", "a2", "a3"):
+            self.submit(scheduler, name, "get_component_info", "a", hold=False)
+        for name in ("b1", "b2"):
+            self.submit(scheduler, name, "get_component_info", "b", hold=False)
+        self.assertEqual(scheduler.metrics()["sessionQueueDepths"], {"a": 3, "b": 2})
+
+        write.finish()
+        deadline = time.monotonic() + TIMEOUT
+        while scheduler.metrics()["completedReads"] < 5:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.001)
+        self.assertEqual(self.log, ["write", "a1", "b1", "a2", "b2", "a3"])
+
+    def test_metrics(self):
+        scheduler = CommandScheduler(max_concurrent_reads=3)
+        with scheduler.slot("get_document_info"):
+            pass
+        with scheduler.slot("add_component", "other"):
+            pass
+
+        metrics = scheduler.metrics()
+        self.assertEqual(metrics["completedReads"], 1)
+        self.assertEqual(metrics["completedWrites"], 1)
+        self.assertEqual(metrics["queueDepth"], 0)
+        self.assertEqual(metrics["sessionQueueDepths"], {})
+        self.assertEqual(metrics["maxConcurrentReads"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()